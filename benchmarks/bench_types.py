@@ -0,0 +1,152 @@
+"""
+Compares memory use and lookup speed of the slotted TimePoint/TimeSpan and
+ProcessRule against the previous dataclass versions.
+
+Run with: python benchmarks/bench_types.py
+"""
+
+import bisect
+import os
+import re
+import sys
+import timeit
+import tracemalloc
+from dataclasses import dataclass
+from typing import Optional, Pattern
+
+# Add project root to path so we can import pyrri
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pyrri.configuration import ProcessRule, RestrictionAction
+from pyrri.weekly_timespans import TimePoint, TimeSpan, WeeklyTimespans
+
+
+# Previous implementations, kept here as the baseline
+@dataclass(order=True, frozen=True)
+class OldTimePoint:
+    weekday: int
+    hour: int
+    minute: int
+
+    def __post_init__(self):
+        if not (0 <= self.weekday <= 6):
+            raise ValueError("Weekday must be between 0 and 6")
+        if not (0 <= self.hour <= 23):
+            raise ValueError("Hour must be between 0 and 23")
+        if not (0 <= self.minute <= 59):
+            raise ValueError("Minute must be between 0 and 59")
+
+
+@dataclass(frozen=True)
+class OldTimeSpan:
+    start: OldTimePoint
+    end: OldTimePoint
+
+    def __post_init__(self):
+        if self.start >= self.end:
+            raise ValueError("Start time must be strictly before end time")
+
+    def contains(self, tp):
+        return self.start <= tp < self.end
+
+
+@dataclass
+class OldProcessRule:
+    process_regex: Optional[Pattern]
+    title_regex: Optional[Pattern]
+    action: RestrictionAction
+    navigate_url: Optional[str] = None
+
+
+def old_is_in_timespan(spans, start_points, weekday, hour, minute):
+    current_tp = OldTimePoint(weekday, hour, minute)
+    idx = bisect.bisect_right(start_points, current_tp)
+    if idx == 0:
+        return False
+    return spans[idx - 1].contains(current_tp)
+
+
+def measure(factory, count=10000):
+    """Returns the bytes allocated per object created by factory."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return size / count
+
+
+def schedule(n):
+    """n non-overlapping 30 minute spans spread over the week."""
+    step = 7 * 24 * 60 // n
+    return [(m, m + 30) for m in range(0, step * n, step)]
+
+
+def main():
+    # Keep benchmark objects distinct so they are not shared/cached
+    tp_args = [(i % 7, i % 24, i % 60) for i in range(10000)]
+    pattern = re.compile("java", re.IGNORECASE)
+
+    print("Bytes per instance (tracemalloc):")
+    rows = [
+        (
+            "TimePoint",
+            measure(lambda i: OldTimePoint(*tp_args[i])),
+            measure(lambda i: TimePoint(*tp_args[i])),
+        ),
+        (
+            "ProcessRule",
+            measure(
+                lambda i: OldProcessRule(pattern, None, RestrictionAction.MINIMIZE)
+            ),
+            measure(lambda i: ProcessRule(pattern, None, RestrictionAction.MINIMIZE)),
+        ),
+    ]
+    for name, old, new in rows:
+        print(f"  {name:12} old={old:7.1f}  new={new:7.1f}")
+
+    print("Lookup time (is_in_timespan, 100000 calls):")
+    for n in (10, 100, 300):
+        ranges = schedule(n)
+        old_spans = [
+            OldTimeSpan(
+                OldTimePoint(s // 1440, s // 60 % 24, s % 60),
+                OldTimePoint(e // 1440, e // 60 % 24, e % 60),
+            )
+            for s, e in ranges
+        ]
+        old_starts = [span.start for span in old_spans]
+        new = WeeklyTimespans(
+            [
+                ((s // 1440, s // 60 % 24, s % 60), (e // 1440, e // 60 % 24, e % 60))
+                for s, e in ranges
+            ]
+        )
+        old_time = timeit.timeit(
+            lambda: old_is_in_timespan(old_spans, old_starts, 3, 12, 15),
+            number=100000,
+        )
+        new_time = timeit.timeit(lambda: new.is_in_timespan(3, 12, 15), number=100000)
+        print(f"  {n:4} spans   old={old_time:.3f}s  new={new_time:.3f}s")
+
+    print("TimePoint comparison time (a < b, 1000000 calls):")
+    a, b = OldTimePoint(1, 2, 3), OldTimePoint(1, 2, 4)
+    print(f"  old={timeit.timeit(lambda: a < b, number=1000000):.3f}s", end="")
+    a, b = TimePoint(1, 2, 3), TimePoint(1, 2, 4)
+    print(f"  new={timeit.timeit(lambda: a < b, number=1000000):.3f}s")
+
+    print("TimeSpan construction time (100000 calls):")
+    old_time = timeit.timeit(
+        lambda: OldTimeSpan(OldTimePoint(0, 1, 0), OldTimePoint(0, 2, 0)),
+        number=100000,
+    )
+    new_time = timeit.timeit(
+        lambda: TimeSpan(TimePoint(0, 1, 0), TimePoint(0, 2, 0)), number=100000
+    )
+    print(f"  old={old_time:.3f}s  new={new_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
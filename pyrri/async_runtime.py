@@ -0,0 +1,200 @@
+import asyncio
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from pyrri.heartbeat import GuardState
+
+
+class AsyncRuntime:
+    """
+    Runs a Tron instance on an asyncio event loop.
+
+    Guard ticks, configuration refresh, restriction actions and log flushing
+    are scheduled as independent tasks, each with its own cadence and timeout,
+    so a slow step (e.g. a hanging download or a browser navigation) does not
+    delay the others. Blocking win32/psutil calls run in a thread pool.
+
+    A call that times out is only abandoned, not interrupted: it keeps its
+    pool worker until it returns. Config server long-polls therefore run in
+    their own daemon thread, so they never delay shutdown.
+    """
+
+    def __init__(
+        self,
+        tron,
+        guard_interval=4.0,
+        idle_interval=30.0,
+        refresh_interval=1200.0,
+        listen_wait=60.0,
+        listen_retry_delay=30.0,
+        flush_interval=1.0,
+        guard_timeout=5.0,
+        refresh_timeout=30.0,
+        action_timeout=15.0,
+        stop_poll_interval=0.25,
+        max_workers=4,
+    ):
+        self.tron = tron
+        self.guard_interval = guard_interval
+        self.idle_interval = idle_interval
+        self.refresh_interval = refresh_interval
+        self.listen_wait = listen_wait
+        self.listen_retry_delay = listen_retry_delay
+        self.flush_interval = flush_interval
+        self.guard_timeout = guard_timeout
+        self.refresh_timeout = refresh_timeout
+        self.action_timeout = action_timeout
+        self.stop_poll_interval = stop_poll_interval
+        self.max_workers = max_workers
+
+        self._executor = None
+        self._stop_event = None
+        # Set together with _stop_event, for the listener thread
+        self._stopped = threading.Event()
+        # At most one pending action; further decisions are dropped until
+        # the action task has caught up.
+        self._actions = None
+
+    async def run(self):
+        """
+        Runs until tron.stop() is called, then cancels all tasks and
+        flushes remaining log lines.
+        """
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="pyrri"
+        )
+        self._stop_event = asyncio.Event()
+        self._stopped.clear()
+        self._actions = asyncio.Queue(maxsize=1)
+        # Restored on exit, so later log() calls are not buffered forever
+        previous_buffer = self.tron.log_buffer
+        if previous_buffer is None:
+            self.tron.log_buffer = deque()
+
+        tasks = [
+            asyncio.create_task(self._watch_stop(), name="watch_stop"),
+            asyncio.create_task(self._guard_loop(), name="guard"),
+            asyncio.create_task(self._action_loop(), name="action"),
+            asyncio.create_task(self._flush_loop(), name="flush"),
+        ]
+        tasks.append(asyncio.create_task(self._maintenance_loop(), name="maintenance"))
+        if self.tron.config_client:
+            threading.Thread(
+                target=self.tron.listen_for_config,
+                args=(self.listen_wait, self.listen_retry_delay, self._stopped),
+                name="pyrri-listen",
+                daemon=True,
+            ).start()
+        elif self.tron.config_url:
+            tasks.append(asyncio.create_task(self._refresh_loop(), name="refresh"))
+
+        try:
+            await self._stop_event.wait()
+        finally:
+            self._stopped.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.tron.heartbeat(GuardState.STOPPED, 0.0)
+            # Written directly, the pool may be busy with abandoned calls
+            try:
+                self.tron.flush_log()
+            except OSError as e:
+                print(f"ERROR: Failed to flush log: {e}")
+            self.tron.log_buffer = previous_buffer
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _call(self, timeout, func, *args):
+        """
+        Runs func in the thread pool and waits at most timeout seconds.
+        On timeout func keeps running and holds its worker until it returns.
+        """
+        loop = asyncio.get_running_loop()
+        return await asyncio.wait_for(
+            loop.run_in_executor(self._executor, func, *args), timeout
+        )
+
+    async def _sleep(self, delay):
+        """
+        Sleeps for delay seconds, returning early if the runtime is stopped.
+        """
+        try:
+            await asyncio.wait_for(self._stop_event.wait(), delay)
+        except TimeoutError:
+            pass
+
+    async def _watch_stop(self):
+        while not self.tron.stopped:
+            await asyncio.sleep(self.stop_poll_interval)
+        self._stop_event.set()
+
+    async def _guard_loop(self):
+        loop = asyncio.get_running_loop()
+        while not self._stop_event.is_set():
+            delay = self.idle_interval
+            state = GuardState.IDLE
+            tick_start = loop.time()
+            try:
+                if self.tron.is_restricted_time():
+                    delay = self.guard_interval
+                    state = GuardState.GUARDING
+                    decision = await self._call(
+                        self.guard_timeout, self.tron.evaluate_guard
+                    )
+                    if decision is not None:
+                        if self._actions.empty():
+                            self._actions.put_nowait(decision)
+                        else:
+                            self.tron.drop_action(*decision)
+            except TimeoutError:
+                # No heartbeat, so a guard that keeps hanging goes stale
+                # and gets restarted by the watchdog.
+                self.tron.log("ERROR: Guard tick timed out")
+                state = None
+            except Exception as e:
+                self.tron.log(f"ERROR: Guard tick failed: {e}")
+            if state is not None:
+                self.tron.heartbeat(state, loop.time() - tick_start)
+            await self._sleep(delay)
+
+    async def _action_loop(self):
+        while True:
+            decision = await self._actions.get()
+            pinfo, action = decision[:2]
+            try:
+                await self._call(
+                    self.action_timeout, self.tron.restriction_action, *decision
+                )
+            except TimeoutError:
+                self.tron.log(f"ERROR: Action {action} timed out for {pinfo=}")
+            except Exception as e:
+                self.tron.log(f"ERROR: Action {action} failed: {e}")
+
+    async def _refresh_loop(self):
+        while not self._stop_event.is_set():
+            await self._sleep(self.refresh_interval)
+            if self._stop_event.is_set():
+                break
+            try:
+                await self._call(self.refresh_timeout, self.tron.update_config)
+            except TimeoutError:
+                self.tron.log("ERROR: Configuration refresh timed out")
+
+    async def _maintenance_loop(self):
+        while not self._stop_event.is_set():
+            await self._sleep(self.guard_interval)
+            try:
+                # Profiler snapshots can take a while with many traces
+                await self._call(self.refresh_timeout, self.tron.maintenance_tick)
+            except Exception as e:
+                self.tron.log(f"ERROR: Maintenance failed: {e}")
+
+    async def _flush_loop(self):
+        while not self._stop_event.is_set():
+            await self._sleep(self.flush_interval)
+            try:
+                await self._call(self.flush_interval * 10, self.tron.flush_log)
+            except Exception as e:
+                # Keep the lines buffered and retry on the next flush.
+                print(f"ERROR: Failed to flush log: {e}")
@@ -0,0 +1,224 @@
+import argparse
+import json
+import secrets
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+from pyrri.json_patch import make_patch
+
+
+class ConfigStore:
+    """
+    Holds the current configuration JSON and a short history of previous
+    versions, so clients can be sent a JSON-patch against the version they
+    already have instead of the whole document.
+
+    Versions are opaque strings prefixed with a random id per store, so a
+    restarted server never mistakes a client's old version for its own.
+    """
+
+    def __init__(self, data=None, history=20):
+        self.history = history
+        self.epoch = secrets.token_hex(4)
+        self.counter = 0
+        self.version = None
+        self.data = None
+        self._versions = OrderedDict()
+        # Responses for clients holding older versions, built on demand
+        self._updates = {}
+        self._changed = threading.Condition()
+        if data is not None:
+            self.publish(data)
+
+    def publish(self, data):
+        """
+        Makes data the current configuration and wakes up waiting clients.
+        Returns the (possibly unchanged) current version.
+        """
+        with self._changed:
+            if self.version is not None and data == self.data:
+                return self.version
+            self.counter += 1
+            self.version = f"{self.epoch}-{self.counter}"
+            self.data = data
+            self._versions[self.version] = data
+            while len(self._versions) > self.history:
+                self._versions.popitem(last=False)
+            self._updates = {}
+            self._changed.notify_all()
+            return self.version
+
+    def wait_for_change(self, version, timeout):
+        """
+        Blocks until the current version differs from version or timeout
+        seconds have passed. Returns whether there is a newer version.
+        """
+        with self._changed:
+            return self._changed.wait_for(
+                lambda: self.version is not None and self.version != version,
+                timeout,
+            )
+
+    def update_for(self, version):
+        """
+        Returns the response body for a client holding version: None if it is
+        up to date, a patch if version is still in the history and the patch is
+        smaller than the configuration, otherwise the full configuration.
+        """
+        with self._changed:
+            if self.version is None or version == self.version:
+                return None
+            full = {"version": self.version, "config": self.data}
+            if version not in self._versions:
+                return full
+            update = self._updates.get(version)
+            if update is None:
+                patch = make_patch(self._versions[version], self.data)
+                # Lists are diffed index by index, so an insertion near the
+                # front can produce a patch larger than the whole document
+                if len(json.dumps(patch)) < len(json.dumps(self.data)):
+                    update = {"version": self.version, "base": version, "patch": patch}
+                else:
+                    update = full
+                self._updates[version] = update
+            return update
+
+
+class ConfigRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /config?version=<v>&wait=<seconds>
+        Long-polls for a version newer than <v>. Answers 304 if nothing
+        changed within <wait> seconds.
+    PUT /config
+        Publishes a new configuration. Requires the server token as
+        "Authorization: Bearer <token>"; disabled if the server has none.
+    """
+
+    server_version = "PyrriConfig/0.1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/config":
+            self.send_error(404)
+            return
+        query = parse_qs(url.query)
+        version = query.get("version", [None])[0]
+        try:
+            wait = float(query.get("wait", ["0"])[0])
+        except ValueError:
+            self.send_error(400, "Invalid wait")
+            return
+        wait = max(0.0, min(wait, self.server.max_wait))
+
+        store = self.server.store
+        if wait:
+            store.wait_for_change(version, wait)
+        update = store.update_for(version)
+        if update is None:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_json(200, update)
+
+    def do_PUT(self):
+        if urlparse(self.path).path != "/config":
+            self.send_error(404)
+            return
+        token = self.server.token
+        if not token or not secrets.compare_digest(
+            self.headers.get("Authorization", ""), f"Bearer {token}"
+        ):
+            self.send_error(403)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data = json.loads(self.rfile.read(length).decode("utf-8"))
+        except ValueError:
+            self.send_error(400, "Invalid JSON")
+            return
+        self.send_json(200, {"version": self.server.store.publish(data)})
+
+    def send_json(self, code, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+
+class ConfigServer(ThreadingHTTPServer):
+    """
+    Small HTTP server distributing one configuration to many Pyrri clients.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, address, store: ConfigStore, token=None, max_wait=120.0, quiet=True
+    ):
+        super().__init__(address, ConfigRequestHandler)
+        self.store = store
+        self.token = token
+        self.max_wait = max_wait
+        self.quiet = quiet
+        self.stopped = threading.Event()
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def watch_file(self, path: Path, interval=1.0):
+        """
+        Starts a thread publishing the JSON file whenever it changes on disk.
+        """
+        path = Path(path)
+
+        def _watch():
+            last_mtime = None
+            while not self.stopped.is_set():
+                try:
+                    mtime = path.stat().st_mtime_ns
+                    if mtime != last_mtime:
+                        last_mtime = mtime
+                        with open(path, "r", encoding="utf-8") as f:
+                            self.store.publish(json.load(f))
+                except (OSError, ValueError) as e:
+                    # Keep serving the last good version
+                    print(f"ERROR: Failed to load {path}: {e}")
+                self.stopped.wait(interval)
+
+        thread = threading.Thread(target=_watch, daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self):
+        self.stopped.set()
+        super().server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a Pyrri configuration.")
+    parser.add_argument("config_file", type=Path)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", help="Allows publishing via PUT /config")
+    args = parser.parse_args()
+
+    server = ConfigServer(
+        (args.host, args.port), ConfigStore(), token=args.token, quiet=False
+    )
+    server.watch_file(args.config_file)
+    print(f"Serving {args.config_file} on {server.url}")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
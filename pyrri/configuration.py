@@ -1,12 +1,19 @@
 import json
 import re
+import urllib.error
+import urllib.parse
 import urllib.request
 from dataclasses import dataclass
 from enum import Enum
-from typing import List, Optional, Pattern
+from typing import Dict, List, Optional, Pattern, Tuple
 from pathlib import Path
 
 from pyrri.weekly_timespans import WeeklyTimespans
+from pyrri.json_patch import PatchError, apply_patch
+
+DEFAULT_NAVIGATE_URL = "https://en.wikipedia.org/wiki/Special:Random"
+# See winproc.core.browser_force_navigate
+NAVIGATE_STRATEGIES = ("input", "paste", "post")
 
 
 class RestrictionAction(Enum):
@@ -16,11 +23,85 @@ class RestrictionAction(Enum):
     IGNORE = "ignore"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessRule:
     process_regex: Optional[Pattern]
     title_regex: Optional[Pattern]
     action: RestrictionAction
+    # Target of FORCE_NAVIGATION, DEFAULT_NAVIGATE_URL if not set
+    navigate_url: Optional[str] = None
+    # How FORCE_NAVIGATION enters the URL, one of NAVIGATE_STRATEGIES
+    navigate_strategy: str = "input"
+
+
+@dataclass(slots=True)
+class Profile:
+    name: str
+    unrestricted_times: WeeklyTimespans
+    rules: List[ProcessRule]
+    # Session user names the profile applies to, None means everyone
+    users: Optional[List[str]] = None
+
+    def applies_to(self, user: str) -> bool:
+        if self.users is None:
+            return True
+        return user.lower() in (u.lower() for u in self.users)
+
+    def is_restricted(self, day: int, hour: int, minute: int) -> bool:
+        return not self.unrestricted_times.is_in_timespan(day, hour, minute)
+
+
+class RuleMatcher:
+    """
+    Matches one window against the rules of several profiles.
+
+    Patterns are compiled through the matcher, so equal regexes in different
+    profiles share one compiled object, and each distinct pattern is searched
+    at most once per match() call.
+    """
+
+    def __init__(self):
+        self._compiled = {}
+
+    def compile(self, pattern: Optional[str]) -> Optional[Pattern]:
+        if not pattern:
+            return None
+        compiled = self._compiled.get(pattern)
+        if compiled is None:
+            compiled = self._compiled[pattern] = re.compile(pattern, re.IGNORECASE)
+        return compiled
+
+    def match(
+        self, profiles: List[Profile], exe_name: Optional[str], title: Optional[str]
+    ) -> List[Tuple[Profile, Optional[int], Optional[ProcessRule]]]:
+        """
+        Returns (profile, index, rule) of the first matching rule for every
+        profile, with index and rule None if no rule matches.
+        """
+        exe_hits = {}
+        title_hits = {}
+
+        def search(hits, pattern, text):
+            hit = hits.get(pattern)
+            if hit is None:
+                hit = hits[pattern] = bool(text) and pattern.search(text) is not None
+            return hit
+
+        results = []
+        for profile in profiles:
+            matched = (profile, None, None)
+            for index, rule in enumerate(profile.rules):
+                if rule.process_regex and not search(
+                    exe_hits, rule.process_regex, exe_name
+                ):
+                    continue
+                if rule.title_regex and not search(title_hits, rule.title_regex, title):
+                    continue
+                # We only apply the first matching rule
+                matched = (profile, index, rule)
+                break
+            results.append(matched)
+        return results
 
 
 class Configuration:
@@ -29,25 +110,22 @@ class Configuration:
         unrestricted_times: WeeklyTimespans,
         rules: List[ProcessRule],
         enabled: bool,
+        profiles: Optional[Dict[str, Profile]] = None,
+        matcher: Optional[RuleMatcher] = None,
     ):
         self.unrestricted_times = unrestricted_times
         self.rules = rules
         self.enabled = enabled
+        # Evaluated in order; the first profile with a matching rule wins
+        if profiles is None:
+            profiles = {"default": Profile("default", unrestricted_times, rules)}
+        self.profiles = profiles
+        self.matcher = matcher or RuleMatcher()
 
     @classmethod
-    def from_json(cls, json_data: dict) -> "Configuration":
-        # Parse timespans
-        # JSON format: [[[d, h, m], [d, h, m]], ...]
-        enabled = json_data.get("enabled", True)
-        raw_times = json_data.get("unrestricted_times", [])
-        # WeeklyTimespans expects iterables of start/end points.
-        # Lists work fine with the * unpacking in WeeklyTimespans.__init__
-
-        unrestricted = WeeklyTimespans(raw_times)
-
-        # Parse rules
+    def parse_rules(cls, raw_rules: list, matcher: RuleMatcher) -> List[ProcessRule]:
         rules = []
-        for rule_data in json_data.get("rules", []):
+        for rule_data in raw_rules:
             proc_pat = rule_data.get("process_regex")
             title_pat = rule_data.get("title_regex")
             action_str = rule_data.get("action")
@@ -61,19 +139,58 @@ class Configuration:
                 # Ignore unknown actions or log them
                 continue
 
+            strategy = rule_data.get("navigate_strategy", "input")
+            if strategy not in NAVIGATE_STRATEGIES:
+                # Unknown strategies fall back to the default
+                strategy = "input"
+
             rules.append(
                 ProcessRule(
-                    process_regex=re.compile(proc_pat, re.IGNORECASE)
-                    if proc_pat
-                    else None,
-                    title_regex=re.compile(title_pat, re.IGNORECASE)
-                    if title_pat
-                    else None,
+                    process_regex=matcher.compile(proc_pat),
+                    title_regex=matcher.compile(title_pat),
                     action=action,
+                    navigate_url=rule_data.get("navigate_url"),
+                    navigate_strategy=strategy,
                 )
             )
+        return rules
+
+    @classmethod
+    def from_json(cls, json_data: dict) -> "Configuration":
+        # Parse timespans
+        # JSON format: [[[d, h, m], [d, h, m]], ...]
+        enabled = json_data.get("enabled", True)
+        raw_times = json_data.get("unrestricted_times", [])
+        # WeeklyTimespans expects iterables of start/end points.
+        # Lists work fine with the * unpacking in WeeklyTimespans.__init__
+
+        unrestricted = WeeklyTimespans(raw_times)
 
-        return cls(unrestricted, rules, enabled)
+        # Parse rules, sharing compiled patterns across all profiles
+        matcher = RuleMatcher()
+        rules = cls.parse_rules(json_data.get("rules", []), matcher)
+
+        # Named profiles: {"name": {"users": [...], "unrestricted_times": [...],
+        # "rules": [...]}}. Top-level times and rules form the "default" profile.
+        raw_profiles = json_data.get("profiles")
+        if raw_profiles is None:
+            return cls(unrestricted, rules, enabled, matcher=matcher)
+
+        profiles = {}
+        if "unrestricted_times" in json_data or "rules" in json_data:
+            profiles["default"] = Profile("default", unrestricted, rules)
+        for name, profile_data in raw_profiles.items():
+            users = profile_data.get("users")
+            if isinstance(users, str):
+                # A single user name, not a list of one-letter names
+                users = [users]
+            profiles[name] = Profile(
+                name,
+                WeeklyTimespans(profile_data.get("unrestricted_times", [])),
+                cls.parse_rules(profile_data.get("rules", []), matcher),
+                users,
+            )
+        return cls(unrestricted, rules, enabled, profiles, matcher)
 
     @classmethod
     def load_from_url(cls, url: str) -> "Configuration":
@@ -89,3 +206,57 @@ class Configuration:
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
             return cls.from_json(data)
+
+
+class ConfigClient:
+    """
+    Long-polls a pyrri.config_server for configuration changes. Keeps the
+    last received JSON so the server only needs to send a patch against it.
+    """
+
+    def __init__(self, server_url: str):
+        self.server_url = server_url.rstrip("/")
+        self.version = None
+        self.data = None
+
+    def reset(self):
+        """
+        Forgets the held version, so the next poll fetches the full config.
+        """
+        self.version = None
+        self.data = None
+
+    def poll(self, wait: float = 0.0) -> Optional[Configuration]:
+        """
+        Waits up to wait seconds for a newer configuration.
+        Returns it, or None if the held version is still current.
+        """
+        query = {"wait": wait}
+        if self.version is not None:
+            query["version"] = self.version
+        url = f"{self.server_url}/config?{urllib.parse.urlencode(query)}"
+        req = urllib.request.Request(url, headers={"User-Agent": "Pyrri/0.1.0"})
+        try:
+            with urllib.request.urlopen(req, timeout=wait + 10) as response:
+                payload = json.loads(response.read().decode("utf-8"))
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                return None
+            raise
+
+        if "patch" in payload:
+            if payload["base"] != self.version:
+                self.reset()
+                raise ValueError(f"Patch is against unknown version {payload['base']}")
+            try:
+                data = apply_patch(self.data, payload["patch"])
+            except PatchError:
+                self.reset()
+                raise
+        else:
+            data = payload["config"]
+
+        config = Configuration.from_json(data)
+        self.version = payload["version"]
+        self.data = data
+        return config
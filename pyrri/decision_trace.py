@@ -0,0 +1,123 @@
+import json
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+@dataclass(slots=True)
+class DecisionRecord:
+    time: float  # Epoch seconds of the first tick with this outcome
+    title: Optional[str]
+    exe_name: Optional[str]
+    pid: Optional[int]
+    hwnd: Optional[int]
+    # (profile name, number of its rules evaluated) for every active profile
+    evaluated: Tuple[Tuple[str, int], ...]
+    profile: Optional[str] = None  # Profile of the matching rule
+    rule: Optional[int] = None  # Index of the matching rule in that profile
+    action: Optional[str] = None
+    # Seconds from the decision until the action finished
+    action_latency: Optional[float] = None
+    # The action was skipped because the previous one was still queued
+    dropped: bool = False
+    # Consecutive identical ticks folded into this record
+    count: int = 1
+    last_time: float = 0.0
+
+    def same_outcome(self, other: "DecisionRecord") -> bool:
+        return (
+            self.pid == other.pid
+            and self.hwnd == other.hwnd
+            and self.title == other.title
+            and self.exe_name == other.exe_name
+            and self.evaluated == other.evaluated
+            and self.rule == other.rule
+            and self.profile == other.profile
+        )
+
+
+class DecisionTrace:
+    """
+    Fixed-size ring buffer of enforcement decisions, so it can be explained
+    later why a window was (or was not) acted on.
+
+    Recording is a slot assignment; ticks without an action that repeat the
+    previous outcome only bump its count. Queries and dumps work on a copy
+    and can run from another thread while the guard keeps recording.
+    """
+
+    def __init__(self, capacity=2048):
+        self.capacity = capacity
+        self._items: List[Optional[DecisionRecord]] = [None] * capacity
+        self._next = 0
+        self._last: Optional[DecisionRecord] = None
+        self._lock = threading.Lock()
+
+    def record(self, rec: DecisionRecord):
+        rec.last_time = rec.time
+        last = self._last
+        if rec.action is None and last is not None and last.same_outcome(rec):
+            last.count += 1
+            last.last_time = rec.time
+            return last
+        with self._lock:
+            self._items[self._next % self.capacity] = rec
+            self._next += 1
+        self._last = rec
+        return rec
+
+    def complete(self, rec: DecisionRecord, done_time: float):
+        """
+        Stores the latency of the action carried out for the decision rec.
+        """
+        rec.action_latency = done_time - rec.time
+
+    def drop(self, rec: DecisionRecord):
+        """
+        Marks the decision rec as not dispatched.
+        """
+        rec.dropped = True
+
+    def records(self) -> List[DecisionRecord]:
+        """
+        Returns the buffered records, oldest first.
+        """
+        with self._lock:
+            end = self._next
+            items = list(self._items)
+        if end <= self.capacity:
+            return items[:end]
+        start = end % self.capacity
+        return items[start:] + items[:start]
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        exe_name: Optional[str] = None,
+    ) -> List[DecisionRecord]:
+        """
+        Returns records overlapping the [start, end] epoch time range and,
+        if given, belonging to exe_name (case-insensitive).
+        """
+        if exe_name is not None:
+            exe_name = exe_name.lower()
+        return [
+            rec
+            for rec in self.records()
+            if (start is None or rec.last_time >= start)
+            and (end is None or rec.time <= end)
+            and (exe_name is None or (rec.exe_name or "").lower() == exe_name)
+        ]
+
+    def dump(self, path: Path, **query):
+        """
+        Writes the (optionally filtered) records to path as JSON lines.
+        Returns the number of records written.
+        """
+        records = self.query(**query)
+        with open(path, mode="wt", encoding="utf-8") as fh:
+            for rec in records:
+                print(json.dumps(asdict(rec)), file=fh)
+        return len(records)
@@ -0,0 +1,118 @@
+import mmap
+import os
+import struct
+import time
+from collections import namedtuple
+from enum import IntEnum
+from pathlib import Path
+
+
+class GuardState(IntEnum):
+    STARTING = 0
+    IDLE = 1  # Unrestricted time, guard is sleeping
+    GUARDING = 2  # Restricted time, guard is checking windows
+    STOPPED = 3  # Clean shutdown, must not be restarted
+
+
+Status = namedtuple(
+    "Status", ["pid", "state", "ticks", "heartbeat", "wall_time", "tick_duration"]
+)
+
+# magic, sequence, pid, state, ticks, heartbeat (time.monotonic() s),
+# wall time (epoch s, informational only), last tick duration (s)
+_LAYOUT = struct.Struct("<4sIIIQddd")
+_SEQ = struct.Struct("<I")
+_SEQ_OFFSET = 4
+_MAGIC = b"PYRR"
+PAGE_SIZE = _LAYOUT.size
+
+
+class StatusPage:
+    """
+    A small fixed-layout status record in a memory-mapped file.
+
+    The guard writes it on every tick and a watchdog process reads it.
+    Writes are a single struct.pack_into, guarded by a sequence counter
+    (odd while a write is in progress) so readers never see a torn record.
+    """
+
+    def __init__(self, path: Path, create=False):
+        self.path = Path(path)
+        self.pid = os.getpid()
+        self.ticks = 0
+        self.seq = 0
+
+        if create:
+            self._prepare_file()
+        with open(self.path, "r+b" if create else "rb") as fh:
+            access = mmap.ACCESS_WRITE if create else mmap.ACCESS_READ
+            self.page = mmap.mmap(fh.fileno(), PAGE_SIZE, access=access)
+
+        if create:
+            # Reuse the existing page (a watchdog may have it mapped) and
+            # continue its sequence so readers never see it go backwards.
+            self.seq = _SEQ.unpack_from(self.page, _SEQ_OFFSET)[0] & ~1
+            self.write(GuardState.STARTING, 0.0)
+
+    def _prepare_file(self):
+        """
+        Makes the file PAGE_SIZE bytes long without truncating it, which
+        Windows refuses while a watchdog has the file mapped.
+        """
+        size = self.path.stat().st_size if self.path.exists() else None
+        if size == PAGE_SIZE:
+            return
+        if size is not None and size < PAGE_SIZE:
+            # Growing a mapped file is allowed, e.g. a page of an older release
+            with open(self.path, "r+b") as fh:
+                fh.truncate(PAGE_SIZE)
+            return
+        # Written under another name first, so readers never see a short file
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as fh:
+            fh.write(b"\0" * PAGE_SIZE)
+        os.replace(tmp, self.path)
+
+    def write(self, state: GuardState, tick_duration: float):
+        self.ticks += 1
+        # Odd sequence marks the record as being written ...
+        self.seq += 1
+        _LAYOUT.pack_into(
+            self.page,
+            0,
+            _MAGIC,
+            self.seq,
+            self.pid,
+            state,
+            self.ticks,
+            # Monotonic time is system-wide on Windows and Linux and cannot
+            # be set back with the system clock
+            time.monotonic(),
+            time.time(),
+            tick_duration,
+        )
+        # ... and the even one publishes it.
+        self.seq += 1
+        _SEQ.pack_into(self.page, _SEQ_OFFSET, self.seq)
+
+    def read(self, retries=100):
+        """
+        Returns the current Status, or None if the page has not been
+        initialized by a guard yet.
+        """
+        for _ in range(retries):
+            seq = _SEQ.unpack_from(self.page, _SEQ_OFFSET)[0]
+            if seq % 2:
+                continue
+            magic, _, pid, state, ticks, heartbeat, wall_time, duration = (
+                _LAYOUT.unpack_from(self.page, 0)
+            )
+            if _SEQ.unpack_from(self.page, _SEQ_OFFSET)[0] != seq:
+                continue
+            if magic != _MAGIC:
+                return None
+            return Status(pid, GuardState(state), ticks, heartbeat, wall_time, duration)
+        return None
+
+    def close(self):
+        self.page.close()
@@ -0,0 +1,104 @@
+import copy
+
+
+class PatchError(ValueError):
+    pass
+
+
+def _escape(key):
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token):
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def make_patch(old, new, path=""):
+    """
+    Returns a list of JSON-patch (RFC 6902) operations turning old into new.
+    Only "add", "remove" and "replace" are emitted.
+    """
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if isinstance(old, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(make_patch(old[key], value, child))
+        return ops
+
+    if isinstance(old, list):
+        ops = []
+        common = min(len(old), len(new))
+        for i in range(common):
+            ops.extend(make_patch(old[i], new[i], f"{path}/{i}"))
+        # Remove from the back so earlier indices stay valid
+        for i in range(len(old) - 1, common - 1, -1):
+            ops.append({"op": "remove", "path": f"{path}/{i}"})
+        for i in range(common, len(new)):
+            ops.append({"op": "add", "path": f"{path}/{i}", "value": new[i]})
+        return ops
+
+    if old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def apply_patch(doc, patch):
+    """
+    Applies JSON-patch operations to a copy of doc and returns the copy.
+    Raises PatchError if an operation does not fit the document.
+    """
+    doc = copy.deepcopy(doc)
+    for op in patch:
+        path = op["path"]
+        if path == "":
+            if op["op"] == "remove":
+                raise PatchError("Cannot remove the document root")
+            doc = copy.deepcopy(op["value"])
+            continue
+
+        tokens = [_unescape(t) for t in path.split("/")[1:]]
+        try:
+            parent = doc
+            for token in tokens[:-1]:
+                parent = parent[int(token) if isinstance(parent, list) else token]
+            last = tokens[-1]
+
+            if isinstance(parent, list):
+                index = len(parent) if last == "-" else int(last)
+                match op["op"]:
+                    case "add":
+                        if index > len(parent):
+                            raise IndexError(index)
+                        parent.insert(index, copy.deepcopy(op["value"]))
+                    case "remove":
+                        del parent[index]
+                    case "replace":
+                        parent[index] = copy.deepcopy(op["value"])
+                    case _:
+                        raise PatchError(f"Unsupported operation {op['op']!r}")
+            else:
+                match op["op"]:
+                    case "add":
+                        parent[last] = copy.deepcopy(op["value"])
+                    case "remove":
+                        del parent[last]
+                    case "replace":
+                        if last not in parent:
+                            raise KeyError(last)
+                        parent[last] = copy.deepcopy(op["value"])
+                    case _:
+                        raise PatchError(f"Unsupported operation {op['op']!r}")
+        except PatchError:
+            raise
+        except (KeyError, IndexError, ValueError, TypeError) as e:
+            raise PatchError(f"Cannot apply {op['op']} at {path!r}: {e}") from e
+    return doc
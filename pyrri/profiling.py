@@ -0,0 +1,134 @@
+import os
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+class AllocationProfiler:
+    """
+    Opt-in memory profiling for the long-running guard.
+
+    Takes a tracemalloc snapshot every interval seconds, or as soon as the
+    control file exists (which is then removed), and appends the top
+    allocation growth sites since the previous snapshot and since start to
+    the report file. The report file is rotated like a log file.
+
+    Tron only creates a profiler when asked to, so there is no tracing
+    overhead otherwise.
+    """
+
+    def __init__(
+        self,
+        report_file: Path,
+        interval=3600.0,
+        control_file: Path = None,
+        top=15,
+        frames=5,
+        max_bytes=1024 * 1024,
+        backups=3,
+    ):
+        self.report_file = Path(report_file)
+        self.interval = interval
+        self.control_file = (
+            Path(control_file)
+            if control_file
+            else self.report_file.with_suffix(".trigger")
+        )
+        self.top = top
+        self.frames = frames
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.baseline = None
+        self.previous = None
+        self.last_snapshot_time = 0.0
+        self.started_tracing = False
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+        self.baseline = self.previous = self.take_snapshot()
+        self.last_snapshot_time = time.monotonic()
+
+    def stop(self):
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+        self.baseline = self.previous = None
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def tick(self):
+        """
+        Called on every guard tick. Returns True if a report was written.
+        """
+        if self.control_file.exists():
+            try:
+                self.control_file.unlink()
+            except OSError:
+                pass
+            self.report("requested")
+            return True
+        if time.monotonic() - self.last_snapshot_time >= self.interval:
+            self.report("periodic")
+            return True
+        return False
+
+    def report(self, reason):
+        snapshot = self.take_snapshot()
+        self.last_snapshot_time = time.monotonic()
+        current, peak = tracemalloc.get_traced_memory()
+
+        lines = [
+            f"=== {datetime.now().isoformat(timespec='seconds')} ({reason}) "
+            f"traced={current / 1024:.1f} KiB peak={peak / 1024:.1f} KiB",
+        ]
+        for title, base in (
+            ("since last snapshot", self.previous),
+            ("since start", self.baseline),
+        ):
+            lines.append(f"--- top {self.top} growth {title}")
+            stats = snapshot.compare_to(base, "traceback")
+            growth = [stat for stat in stats if stat.size_diff > 0][: self.top]
+            for stat in growth:
+                # Most recent frame first
+                frame, *callers = reversed(stat.traceback)
+                lines.append(
+                    f"{stat.size_diff / 1024:+.1f} KiB ({stat.count_diff:+d} blocks) "
+                    f"{frame.filename}:{frame.lineno}"
+                )
+                for caller in callers:
+                    lines.append(f"    from {caller.filename}:{caller.lineno}")
+        self.previous = snapshot
+
+        self.rotate()
+        with open(self.report_file, mode="at", encoding="utf-8") as fh:
+            print("\n".join(lines), file=fh)
+
+    def rotate(self):
+        try:
+            if self.report_file.stat().st_size < self.max_bytes:
+                return
+        except FileNotFoundError:
+            return
+        for i in range(self.backups - 1, 0, -1):
+            src = self.report_file.with_name(f"{self.report_file.name}.{i}")
+            if src.exists():
+                dst = self.report_file.with_name(f"{self.report_file.name}.{i + 1}")
+                os.replace(src, dst)
+        if self.backups > 0:
+            os.replace(
+                self.report_file,
+                self.report_file.with_name(f"{self.report_file.name}.1"),
+            )
+        else:
+            self.report_file.unlink()
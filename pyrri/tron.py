@@ -1,5 +1,9 @@
+import getpass
+import os
 import time
 import signal
+import asyncio
+import threading
 from pathlib import Path
 from collections import namedtuple
 
@@ -12,8 +16,18 @@ from pyrri.winproc.core import (
     minimize_window,
     set_shutdown_handler,
     is_session_locked,
+    wait_for_title_change,
 )
-from pyrri.configuration import Configuration, RestrictionAction
+from pyrri.configuration import (
+    ConfigClient,
+    Configuration,
+    RestrictionAction,
+    DEFAULT_NAVIGATE_URL,
+)
+from pyrri.async_runtime import AsyncRuntime
+from pyrri.heartbeat import GuardState, StatusPage
+from pyrri.profiling import AllocationProfiler
+from pyrri.decision_trace import DecisionRecord, DecisionTrace
 
 ProcessInfo = namedtuple("ProcessInfo", ["title", "exe_name", "pid", "hwnd"])
 
@@ -24,25 +38,85 @@ class Tron:
     be able to restrict even the Master Control Program.
     """
 
-    def __init__(self, logfile, config_url=None, config_file=None, silent=True):
+    def __init__(
+        self,
+        logfile,
+        config_url=None,
+        config_file=None,
+        silent=True,
+        status_file=None,
+        config_server=None,
+        profile_file=None,
+        profile_interval=3600.0,
+        session_user=None,
+        trace_capacity=2048,
+        trace_file=None,
+    ):
         self.logfile = logfile
         self.stopped = False
         self.last_pinfo = None
         self.config = None
         self.config_url = config_url
         self.config_file = config_file
+        # Long-polling client for pyrri.config_server, preferred over config_url
+        self.config_client = ConfigClient(config_server) if config_server else None
         self.last_config_update = 0
         self.silent = silent
+        # Selects which configuration profiles apply
+        self.session_user = session_user or getpass.getuser()
+        # When set to a deque, log lines are buffered and written by flush_log()
+        self.log_buffer = None
+        # Heartbeat page read by pyrri.watchdog
+        self.status_page = StatusPage(status_file, create=True) if status_file else None
+
+        # Recent enforcement decisions, dumped when trace_request_file appears
+        self.trace = DecisionTrace(trace_capacity)
+        self.trace_file = Path(trace_file) if trace_file else None
+        self.trace_request_file = (
+            self.trace_file.with_suffix(".trigger") if trace_file else None
+        )
+        # Opt-in allocation profiling, None means no tracing at all
+        self.profiler = None
+        if profile_file:
+            self.profiler = AllocationProfiler(profile_file, interval=profile_interval)
+            self.profiler.start()
 
         self.update_config()
 
     def log(self, msg):
         if not self.silent:
             print(msg)
+        if self.log_buffer is not None:
+            self.log_buffer.append(msg)
+            return
         with open(self.logfile, mode="at", encoding="utf-8") as fh:
             print(msg, file=fh)
 
+    def flush_log(self):
+        """
+        Writes all buffered log lines to the logfile.
+        Safe to call from another thread while log() is appending.
+        """
+        if not self.log_buffer:
+            return
+        lines = []
+        while self.log_buffer:
+            lines.append(self.log_buffer.popleft())
+        try:
+            with open(self.logfile, mode="at", encoding="utf-8") as fh:
+                for line in lines:
+                    print(line, file=fh)
+        except OSError:
+            # Put the lines back so the next flush can retry them.
+            self.log_buffer.extendleft(reversed(lines))
+            raise
+
     def update_config(self):
+        if self.config_client:
+            if self.poll_config_server(wait=0.0):
+                return
+            # Fall back below; the next successful poll sends the full config
+            self.config_client.reset()
         try:
             if self.config_url:
                 self.log(f"Updating configuration from {self.config_url}")
@@ -57,16 +131,53 @@ class Tron:
         except Exception as e:
             self.log(f"ERROR: Failed to update configuration: {e}")
 
-    def is_restricted_time(self):
-        if not self.config.enabled:
+    def poll_config_server(self, wait):
+        """
+        Waits up to wait seconds for a configuration change on the config
+        server and applies it. Returns False if the server could not be reached.
+        """
+        try:
+            config = self.config_client.poll(wait)
+        except Exception as e:
+            self.log(f"ERROR: Failed to poll config server: {e}")
             return False
+        if config is not None:
+            self.log(f"Configuration version {self.config_client.version} received")
+            self.config = config
+            self.last_config_update = time.time()
+        return True
+
+    def listen_for_config(self, wait=60.0, retry_delay=30.0, stop_event=None):
+        """
+        Long-polls the config server until stopped or stop_event is set.
+        Runs in its own thread; each poll returns after at most wait seconds
+        plus the request timeout.
+        """
+        stop_event = stop_event or threading.Event()
+        while not self.stopped and not stop_event.is_set():
+            if not self.poll_config_server(wait):
+                stop_event.wait(retry_delay)
+
+    def active_profiles(self, day, hour, minute):
+        """
+        Returns the profiles applying to this session that are in
+        restricted time right now.
+        """
+        return [
+            profile
+            for profile in self.config.profiles.values()
+            if profile.applies_to(self.session_user)
+            and profile.is_restricted(day, hour, minute)
+        ]
+
+    def is_restricted_time(self):
         day, hour, minute = get_current_time_info()
 
-        if self.config and self.config.unrestricted_times:
-            # If we have a config, check if we are in an unrestricted timespan
-            if self.config.unrestricted_times.is_in_timespan(day, hour, minute):
+        if self.config:
+            if not self.config.enabled:
                 return False
-            return True
+            # Restricted as long as any of our profiles is
+            return bool(self.active_profiles(day, hour, minute))
 
         # Fallback to hardcoded logic if no config
         # Weekends
@@ -79,13 +190,24 @@ class Tron:
             return hour <= 16 or hour >= 20
 
     def process_guard(self):
+        decision = self.evaluate_guard()
+        if decision is not None:
+            self.restriction_action(*decision)
+
+    def evaluate_guard(self):
+        """
+        Inspects the active window and returns the restriction_action()
+        arguments for the first matching rule, or None if nothing needs
+        to be done. The last argument is the DecisionRecord of this tick,
+        so the action's outcome is stored on the decision it carries out.
+        """
         if is_session_locked():
-            return
+            return None
 
         raw_pinfo = get_active_window_info()
         # Handle case where no window is active
         if not raw_pinfo or raw_pinfo[0] is None:
-            return
+            return None
 
         pinfo = ProcessInfo(*raw_pinfo)
 
@@ -96,50 +218,79 @@ class Tron:
             self.log(f"ACTIVE[{day=} {hour=} {minute=}] {exe_name=} - {title=}")
         self.last_pinfo = pinfo
 
-        if self.config:
-            # Use configuration rules
-            for rule in self.config.rules:
-                match_proc = True
-                match_title = True
-
-                if rule.process_regex:
-                    if not exe_name or not rule.process_regex.search(exe_name):
-                        match_proc = False
-
-                if rule.title_regex:
-                    if not title or not rule.title_regex.search(title):
-                        match_title = False
-
-                if match_proc and match_title:
-                    self.restriction_action(pinfo, rule.action)
-                    # We only apply the first matching rule
-                    break
-        else:
-            # Fallback to hardcoded logic
-            if "chrome" in exe_name:
-                if "Minecraft" in title or "GeForce NOW" in title:
-                    self.restriction_action(
-                        pinfo, RestrictionAction.FORCE_NAVIGATE_WIKIPEDIA
-                    )
-            if (
-                "firefox" in exe_name
-                or "iexplore" in exe_name
-                or "edge" in exe_name
-                or "opera" in exe_name
-            ):
-                self.restriction_action(pinfo, RestrictionAction.TERMINATE)
-            if exe_name == "Minecraft.exe":
-                self.log("ACTION: Minimizing Minecraft Launcher")
-                self.restriction_action(pinfo, RestrictionAction.MINIMIZE)
-            if "java" in exe_name and "Minecraft" in title:
-                self.log("ACTION: Minimizing Minecraft")
-                self.restriction_action(pinfo, RestrictionAction.MINIMIZE)
-            if exe_name == "steamwebhelper.exe":
-                self.log("ACTION: Minimizing Steam")
-                self.restriction_action(pinfo, RestrictionAction.MINIMIZE)
-            if exe_name == "WindowsTerminal.exe":
-                self.log("ACTION: Minimizing Terminal")
-                self.restriction_action(pinfo, RestrictionAction.MINIMIZE)
+        if not self.config:
+            decision = self.fallback_decision(pinfo)
+            rec = self.trace.record(
+                DecisionRecord(
+                    time.time(),
+                    *pinfo,
+                    evaluated=(),
+                    action=decision[1].value if decision else None,
+                )
+            )
+            return (*decision, None, "input", rec) if decision else None
+
+        # Window info is gathered once and matched against all profiles
+        profiles = self.active_profiles(day, hour, minute)
+        decision = None
+        evaluated = []
+        matched_profile = matched_rule = None
+        matches = self.config.matcher.match(profiles, exe_name, title)
+        for profile, index, rule in matches:
+            if rule is None:
+                evaluated.append((profile.name, len(profile.rules)))
+                continue
+            evaluated.append((profile.name, index + 1))
+            if decision is None:
+                # The first profile with a matching rule decides
+                decision = (
+                    pinfo,
+                    rule.action,
+                    rule.navigate_url,
+                    rule.navigate_strategy,
+                )
+                matched_profile, matched_rule = profile.name, index
+
+        rec = self.trace.record(
+            DecisionRecord(
+                time.time(),
+                *pinfo,
+                evaluated=tuple(evaluated),
+                profile=matched_profile,
+                rule=matched_rule,
+                action=decision[1].value if decision else None,
+            )
+        )
+        return (*decision, rec) if decision else None
+
+    def fallback_decision(self, pinfo: ProcessInfo):
+        """
+        Hardcoded rules used while no configuration could be loaded.
+        """
+        title, exe_name, pid, hwnd = pinfo
+        if "chrome" in exe_name:
+            if "Minecraft" in title or "GeForce NOW" in title:
+                return pinfo, RestrictionAction.FORCE_NAVIGATION
+        if (
+            "firefox" in exe_name
+            or "iexplore" in exe_name
+            or "edge" in exe_name
+            or "opera" in exe_name
+        ):
+            return pinfo, RestrictionAction.TERMINATE
+        if exe_name == "Minecraft.exe":
+            self.log("ACTION: Minimizing Minecraft Launcher")
+            return pinfo, RestrictionAction.MINIMIZE
+        if "java" in exe_name and "Minecraft" in title:
+            self.log("ACTION: Minimizing Minecraft")
+            return pinfo, RestrictionAction.MINIMIZE
+        if exe_name == "steamwebhelper.exe":
+            self.log("ACTION: Minimizing Steam")
+            return pinfo, RestrictionAction.MINIMIZE
+        if exe_name == "WindowsTerminal.exe":
+            self.log("ACTION: Minimizing Terminal")
+            return pinfo, RestrictionAction.MINIMIZE
+        return None
 
     def install_signal_handlers(self):
         """
@@ -157,21 +308,93 @@ class Tron:
             signal.signal(signal.SIGSTOP, signal.SIG_IGN)
 
     def run(self):
+        if self.config_client:
+            threading.Thread(target=self.listen_for_config, daemon=True).start()
+
         while not self.stopped:
             # Refresh config every hour if URL is set
-            if self.config_url and (time.time() - self.last_config_update > 1200):
+            if (
+                self.config_url
+                and not self.config_client
+                and (time.time() - self.last_config_update > 1200)
+            ):
                 self.update_config()
 
+            tick_start = time.monotonic()
             if self.is_restricted_time():
                 self.process_guard()
+                self.heartbeat(GuardState.GUARDING, time.monotonic() - tick_start)
                 time.sleep(4.0)
             else:
+                self.heartbeat(GuardState.IDLE, time.monotonic() - tick_start)
                 time.sleep(30.0)  # Sleep longer when not restricted
+            self.maintenance_tick()
+        self.heartbeat(GuardState.STOPPED, 0.0)
+
+    def maintenance_tick(self):
+        """
+        Housekeeping between guard ticks: allocation profiling and
+        on-demand decision trace dumps.
+        """
+        if self.profiler is not None:
+            # Profiling must never stop enforcement, e.g. on a bad report path
+            try:
+                self.profiler.tick()
+            except OSError as e:
+                self.log(f"ERROR: Failed to write allocation profile: {e}")
+        if self.trace_file is not None and self.trace_request_file.exists():
+            self.dump_trace()
+
+    def dump_trace(self, **query):
+        """
+        Writes the decision trace to trace_file as JSON lines, optionally
+        filtered (see DecisionTrace.query). Triggered by creating
+        trace_request_file; the guard loop keeps running.
+        """
+        try:
+            self.trace_request_file.unlink(missing_ok=True)
+            count = self.trace.dump(self.trace_file, **query)
+            self.log(f"Dumped {count} decision records to {self.trace_file}")
+        except OSError as e:
+            self.log(f"ERROR: Failed to dump decision trace: {e}")
+
+    def heartbeat(self, state, tick_duration):
+        if self.status_page is not None:
+            self.status_page.write(state, tick_duration)
+
+    def run_async(self, **kwargs):
+        """
+        Runs the guard on an asyncio event loop instead of the blocking loop.
+        Keyword arguments are passed on to AsyncRuntime.
+        """
+        asyncio.run(AsyncRuntime(self, **kwargs).run())
 
     def stop(self):
         self.stopped = True
 
-    def restriction_action(self, pinfo: ProcessInfo, action: RestrictionAction):
+    def drop_action(
+        self,
+        pinfo: ProcessInfo,
+        action: RestrictionAction,
+        navigate_url=None,
+        navigate_strategy="input",
+        record=None,
+    ):
+        """
+        Called instead of restriction_action() when the decision is not
+        dispatched because the previous action is still pending.
+        """
+        if record is not None:
+            self.trace.drop(record)
+
+    def restriction_action(
+        self,
+        pinfo: ProcessInfo,
+        action: RestrictionAction,
+        navigate_url=None,
+        navigate_strategy="input",
+        record=None,
+    ):
         match action:
             case RestrictionAction.MINIMIZE:
                 self.log(f"Minimizing window '{pinfo.title}' of {pinfo.exe_name}")
@@ -186,13 +409,20 @@ class Tron:
                 self.log(
                     f"Navigating away from browser window '{pinfo.title}' of {pinfo.exe_name}"
                 )
-                time.sleep(2.0)
-                browser_force_navigate(
-                    pinfo.hwnd, "https://en.wikipedia.org/wiki/Special:Random"
+                used = browser_force_navigate(
+                    pinfo.hwnd,
+                    navigate_url or DEFAULT_NAVIGATE_URL,
+                    strategy=navigate_strategy,
                 )
-                time.sleep(5.0)
+                if used != navigate_strategy:
+                    self.log(f"Navigation fell back from {navigate_strategy} to {used}")
+                # Wait for the page to load instead of a fixed delay, so the
+                # next tick does not see the old title again.
+                wait_for_title_change(pinfo.hwnd, pinfo.title, timeout=5.0)
             case _:
                 self.log(f"Unknown restriction {action=} for {pinfo=}")
+        if record is not None:
+            self.trace.complete(record, time.time())
 
 
 if __name__ == "__main__":
@@ -205,6 +435,11 @@ if __name__ == "__main__":
         config_url="https://raw.githubusercontent.com/kadeng/pyrri/refs/heads/main/default_config.json",
         config_file=default_config_path,
         silent=True,
+        status_file=Path.home() / "pyrri_status.bin",
+        # Set to e.g. ~/pyrri_memory.txt to enable allocation profiling
+        profile_file=os.environ.get("PYRRI_PROFILE_FILE"),
+        # Create ~/pyrri_trace.trigger to dump recent decisions
+        trace_file=Path.home() / "pyrri_trace.jsonl",
     )
 
     def on_shutdown(ctrl_type):
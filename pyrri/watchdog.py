@@ -0,0 +1,149 @@
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from pyrri.heartbeat import PAGE_SIZE, GuardState, StatusPage
+
+
+class Watchdog:
+    """
+    Starts the guard as a child process and restarts it when it exits or
+    its heartbeat in the status page goes stale (e.g. hung in urlopen).
+    A guard that reports GuardState.STOPPED has shut down on purpose and
+    is not restarted.
+    """
+
+    def __init__(
+        self,
+        status_path: Path,
+        command,
+        stale_after=120.0,
+        startup_grace=60.0,
+        poll_interval=5.0,
+        log=print,
+    ):
+        self.status_path = Path(status_path)
+        self.command = list(command)
+        self.stale_after = stale_after
+        self.startup_grace = startup_grace
+        self.poll_interval = poll_interval
+        self.log = log
+        self.stopped = False
+        self.process = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.page = None
+        # (st_dev, st_ino) of the mapped status file
+        self.page_id = None
+
+    def start_guard(self):
+        self.process = subprocess.Popen(self.command)
+        self.started_at = time.monotonic()
+        self.log(f"Watchdog: started guard pid={self.process.pid}")
+
+    def kill_guard(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.process.kill()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.log(f"Watchdog: guard pid={self.process.pid} did not exit")
+
+    def read_status(self):
+        try:
+            stat = self.status_path.stat()
+        except OSError:
+            stat = None
+        if stat is None or stat.st_size != PAGE_SIZE:
+            # Missing, just being created, or written by another release
+            self.close_page()
+            return None
+        if self.page is not None and self.page_id != (stat.st_dev, stat.st_ino):
+            # Replaced by a new file, the old mapping would never change again
+            self.close_page()
+        if self.page is None:
+            try:
+                self.page = StatusPage(self.status_path)
+            except (OSError, ValueError):
+                return None
+            self.page_id = (stat.st_dev, stat.st_ino)
+        return self.page.read()
+
+    def close_page(self):
+        if self.page is not None:
+            self.page.close()
+            self.page = None
+
+    def check(self):
+        """
+        Checks the guard once and restarts it if needed.
+        Returns False once the guard has stopped on purpose.
+        """
+        status = self.read_status()
+        ours = status is not None and status.pid == self.process.pid
+
+        if self.process.poll() is not None:
+            if ours and status.state == GuardState.STOPPED:
+                self.log("Watchdog: guard stopped cleanly")
+                return False
+            reason = f"exited with code {self.process.returncode}"
+        elif time.monotonic() - self.started_at < self.startup_grace:
+            return True
+        elif not ours:
+            reason = "never wrote a heartbeat"
+        elif status.state == GuardState.STOPPED:
+            return True
+        elif time.monotonic() - status.heartbeat > self.stale_after:
+            # Monotonic, so setting the system clock back cannot hide a hang
+            reason = f"heartbeat is {time.monotonic() - status.heartbeat:.0f}s old"
+        else:
+            return True
+
+        self.log(f"Watchdog: restarting guard pid={self.process.pid}, {reason}")
+        self.kill_guard()
+        self.restarts += 1
+        self.start_guard()
+        return True
+
+    def run(self):
+        self.start_guard()
+        try:
+            while not self.stopped and self.check():
+                time.sleep(self.poll_interval)
+        finally:
+            if self.stopped:
+                self.kill_guard()
+            self.close_page()
+
+    def stop(self):
+        self.stopped = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Restart the Pyrri guard when its heartbeat goes stale."
+    )
+    parser.add_argument("status_file", type=Path)
+    parser.add_argument("--stale-after", type=float, default=120.0)
+    parser.add_argument("--startup-grace", type=float, default=60.0)
+    parser.add_argument("--poll-interval", type=float, default=5.0)
+    parser.add_argument(
+        "command",
+        nargs=argparse.REMAINDER,
+        help="Guard command, defaults to running pyrri.tron",
+    )
+    args = parser.parse_args()
+
+    command = args.command or [sys.executable, "-m", "pyrri.tron"]
+    if command[0] == "--":
+        command = command[1:]
+    Watchdog(
+        args.status_file,
+        command,
+        stale_after=args.stale_after,
+        startup_grace=args.startup_grace,
+        poll_interval=args.poll_interval,
+    ).run()
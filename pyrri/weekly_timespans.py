@@ -1,41 +1,133 @@
-from dataclasses import dataclass
 from typing import List, Tuple
 import bisect
 
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def to_week_minutes(weekday: int, hour: int, minute: int) -> int:
+    """Validates a time and returns its minutes from the start of the week (Monday 00:00)."""
+    if not (0 <= weekday <= 6):
+        raise ValueError("Weekday must be between 0 and 6")
+    if not (0 <= hour <= 23):
+        raise ValueError("Hour must be between 0 and 23")
+    if not (0 <= minute <= 59):
+        raise ValueError("Minute must be between 0 and 59")
+    return weekday * MINUTES_PER_DAY + hour * 60 + minute
+
 
-@dataclass(order=True, frozen=True)
 class TimePoint:
-    weekday: int  # 0=Monday, 6=Sunday
-    hour: int  # 0-23
-    minute: int  # 0-59
-
-    def __post_init__(self):
-        if not (0 <= self.weekday <= 6):
-            raise ValueError("Weekday must be between 0 and 6")
-        if not (0 <= self.hour <= 23):
-            raise ValueError("Hour must be between 0 and 23")
-        if not (0 <= self.minute <= 59):
-            raise ValueError("Minute must be between 0 and 59")
+    """
+    Immutable point in the week, stored as a single minute-of-week int
+    so that comparisons and hashing are plain int operations.
+    """
+
+    __slots__ = ("minutes",)
+
+    def __init__(self, weekday: int, hour: int, minute: int):
+        object.__setattr__(self, "minutes", to_week_minutes(weekday, hour, minute))
+
+    @classmethod
+    def from_minutes(cls, minutes: int) -> "TimePoint":
+        if not (0 <= minutes < MINUTES_PER_WEEK):
+            raise ValueError("Minutes must be within one week")
+        tp = object.__new__(cls)
+        object.__setattr__(tp, "minutes", minutes)
+        return tp
+
+    @property
+    def weekday(self) -> int:  # 0=Monday, 6=Sunday
+        return self.minutes // MINUTES_PER_DAY
+
+    @property
+    def hour(self) -> int:  # 0-23
+        return self.minutes // 60 % 24
+
+    @property
+    def minute(self) -> int:  # 0-59
+        return self.minutes % 60
 
     def to_minutes(self) -> int:
         """Converts the time point to total minutes from the start of the week (Monday 00:00)."""
-        return self.weekday * 24 * 60 + self.hour * 60 + self.minute
+        return self.minutes
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.minutes == other.minutes
+        return NotImplemented
+
+    def __lt__(self, other):
+        if other.__class__ is self.__class__:
+            return self.minutes < other.minutes
+        return NotImplemented
+
+    def __le__(self, other):
+        if other.__class__ is self.__class__:
+            return self.minutes <= other.minutes
+        return NotImplemented
+
+    def __gt__(self, other):
+        if other.__class__ is self.__class__:
+            return self.minutes > other.minutes
+        return NotImplemented
+
+    def __ge__(self, other):
+        if other.__class__ is self.__class__:
+            return self.minutes >= other.minutes
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.minutes)
+
+    def __reduce__(self):
+        return TimePoint.from_minutes, (self.minutes,)
+
+    def __repr__(self):
+        return (
+            f"TimePoint(weekday={self.weekday}, hour={self.hour}, minute={self.minute})"
+        )
 
 
-@dataclass(frozen=True)
 class TimeSpan:
-    start: TimePoint
-    end: TimePoint
+    """
+    Immutable half-open interval [start, end) within one week.
+    """
 
-    def __post_init__(self):
-        if self.start >= self.end:
+    __slots__ = ("start", "end")
+
+    def __init__(self, start: TimePoint, end: TimePoint):
+        if start >= end:
             raise ValueError("Start time must be strictly before end time")
+        object.__setattr__(self, "start", start)
+        object.__setattr__(self, "end", end)
 
     def contains(self, tp: TimePoint) -> bool:
-        return self.start <= tp < self.end
+        return self.start.minutes <= tp.minutes < self.end.minutes
 
     def overlaps(self, other: "TimeSpan") -> bool:
-        return max(self.start, other.start) < min(self.end, other.end)
+        return max(self.start.minutes, other.start.minutes) < min(
+            self.end.minutes, other.end.minutes
+        )
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"cannot assign to field {name!r}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"cannot delete field {name!r}")
+
+    def __eq__(self, other):
+        if other.__class__ is self.__class__:
+            return self.start == other.start and self.end == other.end
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.start.minutes, self.end.minutes))
 
     # Make TimeSpan comparable based on start time for bisect
     def __lt__(self, other):
@@ -46,6 +138,12 @@ class TimeSpan:
             return self.start < other
         return NotImplemented
 
+    def __reduce__(self):
+        return TimeSpan, (self.start, self.end)
+
+    def __repr__(self):
+        return f"TimeSpan(start={self.start!r}, end={self.end!r})"
+
 
 class WeeklyTimespans:
     def __init__(self, ranges: List[Tuple[Tuple[int, int, int], Tuple[int, int, int]]]):
@@ -65,6 +163,9 @@ class WeeklyTimespans:
 
         # Create a list of start points for bisect
         self.start_points = [span.start for span in self.spans]
+        # Same as plain ints, so lookups need no TimePoint instances
+        self._start_minutes = [span.start.minutes for span in self.spans]
+        self._end_minutes = [span.end.minutes for span in self.spans]
 
     def _add_span(self, new_span: TimeSpan):
         for span in self.spans:
@@ -78,16 +179,15 @@ class WeeklyTimespans:
         """
         Checks if the given time falls into any of the configured timespans.
         """
-        current_tp = TimePoint(weekday, hour, minute)
+        current = to_week_minutes(weekday, hour, minute)
 
         # Find the first span that starts AFTER the current time.
-        # The candidate span that *might* contain current_tp is the one immediately before that.
-        idx = bisect.bisect_right(self.start_points, current_tp)
+        # The candidate span that *might* contain current is the one immediately before that.
+        idx = bisect.bisect_right(self._start_minutes, current)
 
         if idx == 0:
             # Current time is before the first span starts
             return False
 
         # Check the span at idx - 1
-        candidate_span = self.spans[idx - 1]
-        return candidate_span.contains(current_tp)
+        return current < self._end_minutes[idx - 1]
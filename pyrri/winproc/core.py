@@ -1,11 +1,47 @@
 import ctypes
 import time
+import pywintypes
 import win32api
+import win32clipboard
 import win32con
 import win32gui
 import win32process
 import psutil
 
+INPUT_KEYBOARD = 1
+KEYEVENTF_KEYUP = 0x0002
+KEYEVENTF_UNICODE = 0x0004
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [
+        ("wVk", ctypes.c_ushort),
+        ("wScan", ctypes.c_ushort),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    # Only needed so the INPUT union gets the size SendInput expects
+    _fields_ = [
+        ("dx", ctypes.c_long),
+        ("dy", ctypes.c_long),
+        ("mouseData", ctypes.c_ulong),
+        ("dwFlags", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("dwExtraInfo", ctypes.c_size_t),
+    ]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [("ki", KEYBDINPUT), ("mi", MOUSEINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [("type", ctypes.c_ulong), ("union", _INPUTUNION)]
+
 
 def get_active_window_info():
     """
@@ -129,12 +165,140 @@ def send_char(hwnd, char):
     win32api.PostMessage(hwnd, win32con.WM_CHAR, ord(char), 0)
 
 
-def browser_force_navigate(hwnd, url):
+def key_events(key_code, modifiers=()):
+    """
+    Returns (vk, scan, flags) keyboard events for pressing key_code
+    while holding the given modifier keys (e.g. win32con.VK_CONTROL).
+    """
+    events = [(vk, 0, 0) for vk in modifiers]
+    events.append((key_code, 0, 0))
+    events.append((key_code, 0, KEYEVENTF_KEYUP))
+    events.extend((vk, 0, KEYEVENTF_KEYUP) for vk in reversed(modifiers))
+    return events
+
+
+def text_events(text):
+    """
+    Returns (vk, scan, flags) keyboard events typing text as unicode input.
+    Characters outside the BMP are sent as UTF-16 surrogate pairs.
+    """
+    events = []
+    data = text.encode("utf-16-le")
+    for i in range(0, len(data), 2):
+        code_unit = int.from_bytes(data[i : i + 2], "little")
+        events.append((0, code_unit, KEYEVENTF_UNICODE))
+        events.append((0, code_unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP))
+    return events
+
+
+def send_input(events):
+    """
+    Injects all keyboard events with a single SendInput call, so they reach
+    the foreground window as one uninterrupted batch.
+
+    :param events: Iterable of (vk, scan, flags) tuples.
+    :return: The number of events that were injected.
+    """
+    events = list(events)
+    inputs = (INPUT * len(events))()
+    for item, (vk, scan, flags) in zip(inputs, events):
+        item.type = INPUT_KEYBOARD
+        item.union.ki = KEYBDINPUT(vk, scan, flags, 0, 0)
+    return ctypes.windll.user32.SendInput(len(events), inputs, ctypes.sizeof(INPUT))
+
+
+def set_clipboard_text(text):
+    """
+    Replaces the clipboard contents with text.
+    """
+    win32clipboard.OpenClipboard()
+    try:
+        win32clipboard.EmptyClipboard()
+        win32clipboard.SetClipboardText(text, win32con.CF_UNICODETEXT)
+    finally:
+        win32clipboard.CloseClipboard()
+
+
+def wait_until(predicate, timeout, interval=0.02):
+    """
+    Polls predicate until it returns True or timeout seconds have passed.
+    Returns whether predicate became True in time.
+    """
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+    return True
+
+
+def wait_for_idle(hwnd, timeout=1.0):
+    """
+    Waits until the thread owning the window has processed its pending input.
+    Returns False if the window did not respond within timeout seconds.
+    """
+    try:
+        win32gui.SendMessageTimeout(
+            hwnd,
+            win32con.WM_NULL,
+            0,
+            0,
+            win32con.SMTO_ABORTIFHUNG,
+            int(timeout * 1000),
+        )
+    except pywintypes.error:
+        return False
+    return True
+
+
+def wait_for_title_change(hwnd, title, timeout=5.0):
+    """
+    Waits until the window title differs from title, e.g. after a navigation.
     """
-    Sends F6 to focus the address bar, types the URL, and presses Enter.
+    return wait_until(lambda: win32gui.GetWindowText(hwnd) != title, timeout)
+
+
+def browser_force_navigate(hwnd, url, strategy="input", timeout=1.0):
+    """
+    Sends F6 to focus the address bar, enters the URL, and presses Enter.
 
     :param hwnd: The handle of the browser window.
     :param url: The URL string to navigate to.
+    :param strategy: "input" types the URL in one SendInput batch, "paste"
+        puts it on the clipboard and sends Ctrl+V (replacing the clipboard
+        contents), "post" posts one WM_CHAR message per character.
+        "input" and "paste" need hwnd to be the foreground window and fall
+        back to "post" otherwise.
+    :param timeout: Seconds to wait for the window to process each step.
+    :return: The strategy that was used in the end.
+    """
+    if strategy != "post" and win32gui.GetForegroundWindow() != hwnd:
+        strategy = "post"
+
+    if strategy != "post":
+        events = key_events(win32con.VK_F6)
+        # SendInput injects nothing if UIPI blocks it, e.g. for an elevated browser
+        if send_input(events) == len(events):
+            wait_for_idle(hwnd, timeout)
+            if strategy == "paste":
+                set_clipboard_text(url)
+                events = key_events(ord("V"), modifiers=(win32con.VK_CONTROL,))
+            else:
+                events = text_events(url)
+            events += key_events(win32con.VK_RETURN)
+            if send_input(events) == len(events):
+                wait_for_idle(hwnd, timeout)
+                return strategy
+        strategy = "post"
+
+    post_force_navigate(hwnd, url)
+    return strategy
+
+
+def post_force_navigate(hwnd, url):
+    """
+    Navigates by posting messages to the window, which works even if it
+    is not in the foreground.
     """
     # Send F6 to focus address bar
     send_key(hwnd, win32con.VK_F6)
@@ -0,0 +1,189 @@
+import asyncio
+import threading
+import time
+import unittest
+import sys
+import os
+
+# Add project root to path so we can import pyrri
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pyrri.async_runtime import AsyncRuntime
+from pyrri.heartbeat import GuardState
+
+
+class FakeTron:
+    """
+    Implements the subset of the Tron interface used by AsyncRuntime.
+    """
+
+    def __init__(self, decision=None, action_delay=0.0, config_url=None):
+        self.stopped = False
+        self.config_url = config_url
+        self.config_client = None
+        self.maintenance_ticks = 0
+        self.log_buffer = None
+        self.decision = decision
+        self.action_delay = action_delay
+        self.guard_ticks = 0
+        self.actions = []
+        self.dropped = []
+        self.config_updates = 0
+        self.flushed = []
+        self.heartbeats = []
+        self.lock = threading.Lock()
+
+    def log(self, msg):
+        self.log_buffer.append(msg)
+
+    def flush_log(self):
+        while self.log_buffer:
+            self.flushed.append(self.log_buffer.popleft())
+
+    def is_restricted_time(self):
+        return True
+
+    def evaluate_guard(self):
+        with self.lock:
+            self.guard_ticks += 1
+        return self.decision
+
+    def drop_action(self, pinfo, action):
+        self.dropped.append((pinfo, action))
+
+    def restriction_action(self, pinfo, action):
+        time.sleep(self.action_delay)
+        self.actions.append((pinfo, action))
+        self.log(f"ACTION {action}")
+
+    def update_config(self):
+        self.config_updates += 1
+
+    def poll_config_server(self, wait):
+        # Simulates a long-poll that nothing answers
+        time.sleep(wait)
+        return True
+
+    def listen_for_config(self, wait, retry_delay, stop_event):
+        while not self.stopped and not stop_event.is_set():
+            self.poll_config_server(wait)
+
+    def maintenance_tick(self):
+        self.maintenance_ticks += 1
+
+    def heartbeat(self, state, tick_duration):
+        self.heartbeats.append(state)
+
+    def stop(self):
+        self.stopped = True
+
+
+def run_for(runtime, seconds):
+    async def main():
+        task = asyncio.create_task(runtime.run())
+        await asyncio.sleep(seconds)
+        runtime.tron.stop()
+        await asyncio.wait_for(task, 2.0)
+
+    asyncio.run(main())
+
+
+class TestAsyncRuntime(unittest.TestCase):
+    def test_guard_ticks_and_actions(self):
+        tron = FakeTron(decision=("pinfo", "minimize"))
+        runtime = AsyncRuntime(
+            tron, guard_interval=0.01, flush_interval=0.01, stop_poll_interval=0.01
+        )
+        run_for(runtime, 0.2)
+
+        self.assertGreater(tron.guard_ticks, 3)
+        self.assertGreater(len(tron.actions), 0)
+        self.assertIn("ACTION minimize", tron.flushed)
+        self.assertIn(GuardState.GUARDING, tron.heartbeats)
+        self.assertEqual(tron.heartbeats[-1], GuardState.STOPPED)
+        self.assertGreater(tron.maintenance_ticks, 0)
+        # Logging is unbuffered again once the runtime has stopped
+        self.assertIsNone(tron.log_buffer)
+
+    def test_slow_action_does_not_block_guard(self):
+        tron = FakeTron(decision=("pinfo", "force_navigation"), action_delay=0.5)
+        runtime = AsyncRuntime(
+            tron, guard_interval=0.01, flush_interval=0.01, stop_poll_interval=0.01
+        )
+        run_for(runtime, 0.3)
+
+        # Guard keeps ticking while the first action is still running
+        self.assertGreater(tron.guard_ticks, 5)
+        self.assertEqual(len(tron.actions), 0)
+        # Decisions arriving while one is still queued are reported as dropped
+        self.assertGreater(len(tron.dropped), 3)
+
+    def test_action_timeout_is_logged(self):
+        tron = FakeTron(decision=("pinfo", "terminate"), action_delay=0.2)
+        runtime = AsyncRuntime(
+            tron,
+            guard_interval=0.01,
+            flush_interval=0.01,
+            action_timeout=0.05,
+            stop_poll_interval=0.01,
+        )
+        run_for(runtime, 0.15)
+
+        self.assertTrue(any("timed out" in line for line in tron.flushed))
+
+    def test_config_refresh(self):
+        tron = FakeTron(config_url="http://example.invalid/config.json")
+        runtime = AsyncRuntime(
+            tron,
+            guard_interval=0.01,
+            refresh_interval=0.02,
+            flush_interval=0.01,
+            stop_poll_interval=0.01,
+        )
+        run_for(runtime, 0.2)
+
+        self.assertGreater(tron.config_updates, 2)
+
+    def test_no_refresh_without_url(self):
+        tron = FakeTron()
+        runtime = AsyncRuntime(
+            tron, refresh_interval=0.01, flush_interval=0.01, stop_poll_interval=0.01
+        )
+        run_for(runtime, 0.1)
+
+        self.assertEqual(tron.config_updates, 0)
+
+    def test_stop_does_not_wait_for_long_poll(self):
+        tron = FakeTron()
+        tron.config_client = object()
+        runtime = AsyncRuntime(
+            tron, listen_wait=10.0, flush_interval=0.01, stop_poll_interval=0.01
+        )
+        start = time.monotonic()
+        run_for(runtime, 0.1)
+
+        self.assertLess(time.monotonic() - start, 2.0)
+        listeners = [t for t in threading.enumerate() if t.name == "pyrri-listen"]
+        self.assertTrue(listeners)
+        self.assertTrue(all(t.daemon for t in listeners))
+
+    def test_final_flush_with_busy_pool(self):
+        tron = FakeTron(decision=("pinfo", "minimize"), action_delay=2.0)
+        runtime = AsyncRuntime(
+            tron,
+            guard_interval=0.01,
+            flush_interval=0.01,
+            guard_timeout=0.05,
+            stop_poll_interval=0.01,
+            max_workers=1,
+        )
+        start = time.monotonic()
+        run_for(runtime, 0.2)
+
+        # The only worker is stuck in the action, the flush still happens
+        self.assertLess(time.monotonic() - start, 1.5)
+        self.assertTrue(any("timed out" in line for line in tron.flushed))
+
+
+if __name__ == "__main__":
+    unittest.main()
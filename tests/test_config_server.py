@@ -0,0 +1,143 @@
+import json
+import threading
+import time
+import unittest
+import urllib.error
+import urllib.request
+import sys
+import os
+
+# Add project root to path so we can import pyrri
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pyrri.config_server import ConfigServer, ConfigStore
+from pyrri.configuration import ConfigClient, RestrictionAction
+
+CONFIG = {
+    "enabled": True,
+    "unrestricted_times": [[[0, 16, 0], [0, 20, 30]]],
+    "rules": [{"process_regex": "java", "action": "minimize"}],
+}
+
+
+def with_action(action):
+    data = json.loads(json.dumps(CONFIG))
+    data["rules"][0]["action"] = action
+    return data
+
+
+class TestConfigStore(unittest.TestCase):
+    def test_versions_and_patches(self):
+        store = ConfigStore(CONFIG)
+        v1 = store.version
+        self.assertEqual(store.update_for(None), {"version": v1, "config": CONFIG})
+        self.assertIsNone(store.update_for(v1))
+
+        # Publishing identical data keeps the version
+        self.assertEqual(store.publish(with_action("minimize")), v1)
+
+        v2 = store.publish(with_action("terminate"))
+        update = store.update_for(v1)
+        self.assertEqual(update["version"], v2)
+        self.assertEqual(update["base"], v1)
+        self.assertEqual(len(update["patch"]), 1)
+
+    def test_unknown_version_gets_full_config(self):
+        store = ConfigStore(CONFIG, history=1)
+        v1 = store.version
+        store.publish(with_action("terminate"))
+        self.assertIn("config", store.update_for(v1))
+        self.assertIn("config", store.update_for("other-1"))
+
+    def test_large_patch_gets_full_config(self):
+        data = json.loads(json.dumps(CONFIG))
+        data["rules"] = [
+            {"process_regex": f"game{i}", "action": "minimize"} for i in range(10)
+        ]
+        store = ConfigStore(data)
+        v1 = store.version
+
+        # Inserting at the front shifts every rule, so each index is replaced
+        inserted = json.loads(json.dumps(data))
+        inserted["rules"].insert(0, {"process_regex": "java", "action": "terminate"})
+        v2 = store.publish(inserted)
+        self.assertEqual(store.update_for(v1), {"version": v2, "config": inserted})
+
+    def test_wait_for_change(self):
+        store = ConfigStore(CONFIG)
+        v1 = store.version
+        self.assertFalse(store.wait_for_change(v1, 0.05))
+
+        threading.Timer(0.05, store.publish, [with_action("terminate")]).start()
+        start = time.monotonic()
+        self.assertTrue(store.wait_for_change(v1, 5.0))
+        self.assertLess(time.monotonic() - start, 2.0)
+
+
+class TestConfigServer(unittest.TestCase):
+    def setUp(self):
+        self.store = ConfigStore(CONFIG)
+        self.server = ConfigServer(("127.0.0.1", 0), self.store, token="secret")
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def put(self, data, token="secret"):
+        req = urllib.request.Request(
+            f"{self.server.url}/config",
+            data=json.dumps(data).encode("utf-8"),
+            method="PUT",
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        with urllib.request.urlopen(req, timeout=5) as response:
+            return json.loads(response.read())
+
+    def test_client_full_then_patch(self):
+        client = ConfigClient(self.server.url)
+        config = client.poll()
+        self.assertEqual(config.rules[0].action, RestrictionAction.MINIMIZE)
+        self.assertEqual(client.version, self.store.version)
+
+        # Nothing changed
+        self.assertIsNone(client.poll(wait=0.05))
+
+        self.store.publish(with_action("terminate"))
+        config = client.poll()
+        self.assertEqual(config.rules[0].action, RestrictionAction.TERMINATE)
+        self.assertEqual(client.data, with_action("terminate"))
+
+    def test_long_poll_wakes_on_push(self):
+        client = ConfigClient(self.server.url)
+        client.poll()
+
+        threading.Timer(0.1, self.put, [with_action("terminate")]).start()
+        start = time.monotonic()
+        config = client.poll(wait=10.0)
+        self.assertLess(time.monotonic() - start, 5.0)
+        self.assertEqual(config.rules[0].action, RestrictionAction.TERMINATE)
+
+    def test_put_requires_token(self):
+        with self.assertRaises(urllib.error.HTTPError) as cm:
+            self.put(with_action("terminate"), token="wrong")
+        self.assertEqual(cm.exception.code, 403)
+        self.assertEqual(self.store.data, CONFIG)
+
+    def test_client_recovers_from_unknown_base(self):
+        client = ConfigClient(self.server.url)
+        client.poll()
+        # Simulate a client that lost its data but kept a stale version
+        client.data = {}
+        self.store.publish(with_action("terminate"))
+        with self.assertRaises(ValueError):
+            client.poll()
+        self.assertIsNone(client.version)
+        config = client.poll()
+        self.assertEqual(config.rules[0].action, RestrictionAction.TERMINATE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import unittest
+import sys
+import os
+
+# Add project root to path so we can import pyrri
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pyrri.configuration import (
+    Configuration,
+    ProcessRule,
+    Profile,
+    RestrictionAction,
+    RuleMatcher,
+)
+from pyrri.weekly_timespans import WeeklyTimespans
+
+MINIMIZE = RestrictionAction.MINIMIZE
+
+PROFILES = {
+    "enabled": True,
+    "unrestricted_times": [[[0, 16, 0], [0, 20, 0]]],
+    "rules": [{"process_regex": "firefox", "action": "terminate"}],
+    "profiles": {
+        "alice": {
+            "users": ["Alice"],
+            "unrestricted_times": [[[0, 10, 0], [0, 18, 0]]],
+            "rules": [
+                {
+                    "process_regex": "java",
+                    "title_regex": "Minecraft",
+                    "action": "minimize",
+                }
+            ],
+        },
+        "bob": {
+            "users": ["bob"],
+            "unrestricted_times": [],
+            "rules": [
+                {"process_regex": "java", "action": "terminate"},
+                {"process_regex": "firefox", "action": "ignore"},
+            ],
+        },
+    },
+}
+
+
+class TestConfiguration(unittest.TestCase):
+    def test_single_profile_compatibility(self):
+        config = Configuration.from_json(
+            {"rules": [{"process_regex": "java", "action": "minimize"}]}
+        )
+
+        self.assertEqual(list(config.profiles), ["default"])
+        self.assertIs(config.profiles["default"].rules, config.rules)
+        self.assertTrue(config.profiles["default"].applies_to("anyone"))
+
+    def test_navigate_options(self):
+        config = Configuration.from_json(
+            {
+                "rules": [
+                    {
+                        "process_regex": "chrome",
+                        "action": "force_navigation",
+                        "navigate_url": "https://example.org",
+                        "navigate_strategy": "paste",
+                    },
+                    {
+                        "process_regex": "edge",
+                        "action": "force_navigation",
+                        "navigate_strategy": "teleport",
+                    },
+                ]
+            }
+        )
+
+        self.assertEqual(config.rules[0].navigate_url, "https://example.org")
+        self.assertEqual(config.rules[0].navigate_strategy, "paste")
+        self.assertIsNone(config.rules[1].navigate_url)
+        self.assertEqual(config.rules[1].navigate_strategy, "input")
+
+    def test_profiles(self):
+        config = Configuration.from_json(PROFILES)
+
+        self.assertEqual(list(config.profiles), ["default", "alice", "bob"])
+        alice = config.profiles["alice"]
+        self.assertTrue(alice.applies_to("alice"))
+        self.assertFalse(alice.applies_to("bob"))
+        self.assertFalse(alice.is_restricted(0, 12, 0))
+        self.assertTrue(config.profiles["bob"].is_restricted(0, 12, 0))
+
+    def test_profiles_without_default(self):
+        data = dict(PROFILES)
+        del data["unrestricted_times"]
+        del data["rules"]
+        config = Configuration.from_json(data)
+
+        self.assertEqual(list(config.profiles), ["alice", "bob"])
+
+    def test_single_user_string(self):
+        config = Configuration.from_json(
+            {"profiles": {"alice": {"users": "alice", "rules": []}}}
+        )
+
+        alice = config.profiles["alice"]
+        self.assertEqual(alice.users, ["alice"])
+        self.assertTrue(alice.applies_to("Alice"))
+        self.assertFalse(alice.applies_to("a"))
+
+    def test_patterns_are_shared(self):
+        config = Configuration.from_json(PROFILES)
+
+        alice_rule = config.profiles["alice"].rules[0]
+        bob_rule = config.profiles["bob"].rules[0]
+        self.assertIs(alice_rule.process_regex, bob_rule.process_regex)
+
+    def test_match_all_profiles(self):
+        config = Configuration.from_json(PROFILES)
+        profiles = list(config.profiles.values())
+
+        results = config.matcher.match(profiles, "java.exe", "Minecraft 1.21")
+        actions = {
+            profile.name: rule.action if rule else None for profile, _, rule in results
+        }
+        self.assertEqual(
+            actions,
+            {
+                "default": None,
+                "alice": RestrictionAction.MINIMIZE,
+                "bob": RestrictionAction.TERMINATE,
+            },
+        )
+        self.assertEqual([index for _, index, _ in results], [None, 0, 0])
+
+    def test_match_searches_each_pattern_once(self):
+        searched = []
+
+        class CountingPattern:
+            def __init__(self, pattern):
+                self.pattern = pattern
+
+            def search(self, text):
+                searched.append(self.pattern)
+                return None
+
+        class CountingMatcher(RuleMatcher):
+            def compile(self, pattern):
+                compiled = super().compile(pattern)
+                return CountingPattern(pattern) if compiled else None
+
+        matcher = CountingMatcher()
+        shared = matcher.compile("java")
+        profiles = [
+            Profile("a", WeeklyTimespans([]), [ProcessRule(shared, None, MINIMIZE)]),
+            Profile("b", WeeklyTimespans([]), [ProcessRule(shared, None, MINIMIZE)]),
+        ]
+        matcher.match(profiles, "notepad.exe", "Untitled")
+
+        self.assertEqual(searched, ["java"])
+
+    def test_match_without_window_info(self):
+        config = Configuration.from_json(PROFILES)
+        results = config.matcher.match(list(config.profiles.values()), None, None)
+        self.assertTrue(all(rule is None for _, _, rule in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
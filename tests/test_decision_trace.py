@@ -0,0 +1,130 @@
+import json
+import tempfile
+import threading
+import unittest
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path so we can import pyrri
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pyrri.decision_trace import DecisionRecord, DecisionTrace
+
+
+def make_record(t, exe_name="java.exe", title="Minecraft", action=None, pid=1):
+    return DecisionRecord(
+        t,
+        title,
+        exe_name,
+        pid,
+        100 + pid,
+        evaluated=(("default", 3),),
+        profile="default" if action else None,
+        rule=2 if action else None,
+        action=action,
+    )
+
+
+class TestDecisionTrace(unittest.TestCase):
+    def test_ring_buffer_keeps_latest(self):
+        trace = DecisionTrace(capacity=3)
+        for i in range(5):
+            trace.record(make_record(float(i), pid=i))
+
+        self.assertEqual([rec.pid for rec in trace.records()], [2, 3, 4])
+
+    def test_repeated_outcome_is_folded(self):
+        trace = DecisionTrace(capacity=3)
+        trace.record(make_record(1.0))
+        trace.record(make_record(2.0))
+        trace.record(make_record(3.0))
+
+        records = trace.records()
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].count, 3)
+        self.assertEqual(records[0].time, 1.0)
+        self.assertEqual(records[0].last_time, 3.0)
+
+    def test_actions_are_not_folded(self):
+        trace = DecisionTrace()
+        trace.record(make_record(1.0, action="minimize"))
+        trace.record(make_record(2.0, action="minimize"))
+
+        self.assertEqual(len(trace.records()), 2)
+
+    def test_complete_sets_latency(self):
+        trace = DecisionTrace()
+        rec = trace.record(make_record(10.0, action="minimize"))
+        trace.record(make_record(11.0, exe_name="notepad.exe", pid=2))
+
+        trace.complete(rec, 10.25)
+
+        self.assertAlmostEqual(trace.records()[0].action_latency, 0.25)
+        self.assertIsNone(trace.records()[1].action_latency)
+
+    def test_decision_queued_while_action_runs(self):
+        trace = DecisionTrace()
+        first = trace.record(make_record(0.0, action="force_navigation"))
+        # Queued for the same window while the first action is still running
+        second = trace.record(make_record(4.0, action="force_navigation"))
+        dropped = trace.record(make_record(8.0, action="force_navigation"))
+        trace.drop(dropped)
+
+        trace.complete(first, 5.5)
+        trace.complete(second, 9.0)
+
+        self.assertAlmostEqual(first.action_latency, 5.5)
+        self.assertAlmostEqual(second.action_latency, 5.0)
+        self.assertTrue(dropped.dropped)
+        self.assertIsNone(dropped.action_latency)
+
+    def test_query(self):
+        trace = DecisionTrace()
+        trace.record(make_record(10.0, exe_name="java.exe", pid=1))
+        trace.record(make_record(20.0, exe_name="chrome.exe", pid=2))
+        trace.record(make_record(30.0, exe_name="Java.exe", pid=3))
+
+        self.assertEqual([rec.pid for rec in trace.query(exe_name="JAVA.EXE")], [1, 3])
+        self.assertEqual([rec.pid for rec in trace.query(start=15.0)], [2, 3])
+        self.assertEqual([rec.pid for rec in trace.query(start=15.0, end=25.0)], [2])
+
+    def test_dump(self):
+        trace = DecisionTrace()
+        trace.record(make_record(10.0, action="terminate"))
+        trace.record(make_record(20.0, exe_name="chrome.exe", pid=2))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "trace.jsonl"
+            self.assertEqual(trace.dump(path, exe_name="java.exe"), 1)
+            lines = path.read_text().splitlines()
+
+        self.assertEqual(len(lines), 1)
+        data = json.loads(lines[0])
+        self.assertEqual(data["action"], "terminate")
+        self.assertEqual(data["evaluated"], [["default", 3]])
+
+    def test_query_while_recording(self):
+        trace = DecisionTrace(capacity=64)
+        stop = threading.Event()
+
+        def writer():
+            i = 0
+            while not stop.is_set():
+                trace.record(make_record(float(i), pid=i))
+                i += 1
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            for _ in range(200):
+                records = trace.records()
+                self.assertLessEqual(len(records), 64)
+                self.assertNotIn(None, records)
+        finally:
+            stop.set()
+            thread.join()
+
+
+if __name__ == "__main__":
+    unittest.main()
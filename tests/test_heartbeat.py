@@ -0,0 +1,162 @@
+import unittest
+import tempfile
+import threading
+import time
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path so we can import pyrri
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, PROJECT_ROOT)
+
+from pyrri.heartbeat import PAGE_SIZE, GuardState, StatusPage
+from pyrri.watchdog import Watchdog
+
+# Stand-in for the guard: writes a few heartbeats, then either hangs or
+# stops cleanly, and records each start in a file.
+FAKE_GUARD = """
+import sys, time
+sys.path.insert(0, {root!r})
+from pyrri.heartbeat import GuardState, StatusPage
+with open({starts!r}, "a") as fh:
+    fh.write("start\\n")
+page = StatusPage({status!r}, create=True)
+for _ in range(3):
+    page.write(GuardState.GUARDING, 0.001)
+    time.sleep(0.05)
+if {clean_stop!r}:
+    page.write(GuardState.STOPPED, 0.0)
+    sys.exit(0)
+time.sleep(60)
+"""
+
+
+class TestStatusPage(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "status.bin"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_write_and_read(self):
+        writer = StatusPage(self.path, create=True)
+        reader = StatusPage(self.path)
+
+        status = reader.read()
+        self.assertEqual(status.state, GuardState.STARTING)
+        self.assertEqual(status.pid, os.getpid())
+
+        writer.write(GuardState.GUARDING, 0.25)
+        status = reader.read()
+        self.assertEqual(status.state, GuardState.GUARDING)
+        self.assertEqual(status.ticks, 2)
+        self.assertAlmostEqual(status.tick_duration, 0.25)
+        self.assertLess(time.monotonic() - status.heartbeat, 5.0)
+        self.assertLess(abs(time.time() - status.wall_time), 5.0)
+
+        writer.close()
+        reader.close()
+
+    def test_uninitialized_page(self):
+        self.path.write_bytes(b"\0" * 64)
+        reader = StatusPage(self.path)
+        self.assertIsNone(reader.read())
+        reader.close()
+
+    def test_recreate_keeps_sequence(self):
+        first = StatusPage(self.path, create=True)
+        first.write(GuardState.IDLE, 0.0)
+        reader = StatusPage(self.path)
+
+        second = StatusPage(self.path, create=True)
+        self.assertGreater(second.seq, first.seq)
+        self.assertEqual(reader.read().state, GuardState.STARTING)
+
+        first.close()
+        second.close()
+        reader.close()
+
+    def test_create_grows_old_page_in_place(self):
+        # Page written by a release with a smaller layout
+        self.path.write_bytes(b"\0" * 40)
+        inode = self.path.stat().st_ino
+
+        writer = StatusPage(self.path, create=True)
+        self.assertEqual(self.path.stat().st_size, PAGE_SIZE)
+        self.assertEqual(self.path.stat().st_ino, inode)
+        writer.close()
+
+
+class TestWatchdog(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.status = Path(self.tmpdir.name) / "status.bin"
+        self.starts = Path(self.tmpdir.name) / "starts.txt"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_watchdog(self, clean_stop):
+        code = FAKE_GUARD.format(
+            root=PROJECT_ROOT,
+            starts=str(self.starts),
+            status=str(self.status),
+            clean_stop=clean_stop,
+        )
+        return Watchdog(
+            self.status,
+            [sys.executable, "-c", code],
+            stale_after=0.3,
+            startup_grace=0.5,
+            poll_interval=0.05,
+            log=lambda msg: None,
+        )
+
+    def count_starts(self):
+        if not self.starts.exists():
+            return 0
+        return len(self.starts.read_text().splitlines())
+
+    def test_short_status_file_is_not_mapped(self):
+        watchdog = self.make_watchdog(clean_stop=True)
+        for size in (0, 40):
+            self.status.write_bytes(b"\0" * size)
+            self.assertIsNone(watchdog.read_status())
+            self.assertIsNone(watchdog.page)
+
+        writer = StatusPage(self.status, create=True)
+        self.assertEqual(watchdog.read_status().pid, os.getpid())
+        writer.close()
+        watchdog.close_page()
+
+    def test_restarts_hung_guard(self):
+        watchdog = self.make_watchdog(clean_stop=False)
+        thread = threading.Thread(target=watchdog.run)
+        thread.start()
+        try:
+            deadline = time.time() + 10.0
+            while self.count_starts() < 2 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            watchdog.stop()
+            thread.join(5.0)
+
+        self.assertGreaterEqual(watchdog.restarts, 1)
+        self.assertGreaterEqual(self.count_starts(), 2)
+        self.assertIsNotNone(watchdog.process.poll())
+
+    def test_clean_stop_is_not_restarted(self):
+        watchdog = self.make_watchdog(clean_stop=True)
+        thread = threading.Thread(target=watchdog.run)
+        thread.start()
+        thread.join(10.0)
+
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(watchdog.restarts, 0)
+        self.assertEqual(self.count_starts(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
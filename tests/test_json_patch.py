@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+
+# Add project root to path so we can import pyrri
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pyrri.json_patch import PatchError, apply_patch, make_patch
+
+
+class TestJsonPatch(unittest.TestCase):
+    def assertRoundTrip(self, old, new):
+        patch = make_patch(old, new)
+        self.assertEqual(apply_patch(old, patch), new)
+        return patch
+
+    def test_identical(self):
+        self.assertEqual(self.assertRoundTrip({"a": [1, 2]}, {"a": [1, 2]}), [])
+
+    def test_dict_changes(self):
+        patch = self.assertRoundTrip(
+            {"enabled": True, "old": 1, "a/b": 2},
+            {"enabled": False, "new": 3, "a/b": 4},
+        )
+        self.assertIn({"op": "replace", "path": "/enabled", "value": False}, patch)
+        self.assertIn({"op": "remove", "path": "/old"}, patch)
+        self.assertIn({"op": "replace", "path": "/a~1b", "value": 4}, patch)
+
+    def test_list_grow_and_shrink(self):
+        self.assertRoundTrip([1, 2, 3, 4], [1, 5])
+        self.assertRoundTrip([1], [1, 2, {"x": 3}])
+
+    def test_config_rule_change_is_small(self):
+        old = {
+            "enabled": True,
+            "rules": [
+                {"process_regex": "chrome", "action": "force_navigation"},
+                {"process_regex": "java", "action": "minimize"},
+            ],
+        }
+        new = {
+            "enabled": True,
+            "rules": [
+                {"process_regex": "chrome", "action": "force_navigation"},
+                {"process_regex": "java", "action": "terminate"},
+            ],
+        }
+        patch = self.assertRoundTrip(old, new)
+        self.assertEqual(
+            patch, [{"op": "replace", "path": "/rules/1/action", "value": "terminate"}]
+        )
+
+    def test_type_change_replaces(self):
+        self.assertRoundTrip({"a": [1]}, {"a": {"b": 1}})
+        self.assertRoundTrip([1], {"a": 1})
+
+    def test_does_not_modify_input(self):
+        old = {"a": [1, 2]}
+        apply_patch(old, [{"op": "add", "path": "/a/-", "value": 3}])
+        self.assertEqual(old, {"a": [1, 2]})
+
+    def test_invalid_patch(self):
+        with self.assertRaises(PatchError):
+            apply_patch({"a": 1}, [{"op": "remove", "path": "/b"}])
+        with self.assertRaises(PatchError):
+            apply_patch({"a": [1]}, [{"op": "replace", "path": "/a/5", "value": 1}])
+        with self.assertRaises(PatchError):
+            apply_patch({"a": 1}, [{"op": "move", "path": "/a"}])
+
+
+if __name__ == "__main__":
+    unittest.main()
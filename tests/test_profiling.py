@@ -0,0 +1,89 @@
+import unittest
+import tempfile
+import tracemalloc
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path so we can import pyrri
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pyrri.profiling import AllocationProfiler
+
+
+def leak(store):
+    # Distinctive allocation site for the report
+    store.extend(bytearray(1024) for _ in range(500))
+
+
+class TestAllocationProfiler(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.report = Path(self.tmpdir.name) / "memory.txt"
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_periodic_report_shows_growth(self):
+        profiler = AllocationProfiler(self.report, interval=0.0)
+        profiler.start()
+        try:
+            store = []
+            leak(store)
+            self.assertTrue(profiler.tick())
+        finally:
+            profiler.stop()
+
+        text = self.report.read_text()
+        self.assertIn("(periodic)", text)
+        self.assertIn("since last snapshot", text)
+        self.assertIn("test_profiling.py", text)
+        self.assertFalse(tracemalloc.is_tracing())
+
+    def test_control_file_trigger(self):
+        profiler = AllocationProfiler(self.report, interval=3600.0)
+        profiler.start()
+        try:
+            self.assertFalse(profiler.tick())
+            self.assertFalse(self.report.exists())
+
+            profiler.control_file.touch()
+            self.assertTrue(profiler.tick())
+            self.assertFalse(profiler.control_file.exists())
+            self.assertFalse(profiler.tick())
+        finally:
+            profiler.stop()
+
+        self.assertIn("(requested)", self.report.read_text())
+
+    def test_unwritable_report_waits_for_next_interval(self):
+        report = Path(self.tmpdir.name) / "missing" / "memory.txt"
+        control = Path(self.tmpdir.name) / "memory.trigger"
+        profiler = AllocationProfiler(report, interval=3600.0, control_file=control)
+        profiler.start()
+        try:
+            control.touch()
+            with self.assertRaises(OSError):
+                profiler.tick()
+            # The failed report still counts, so it is not retried every tick
+            self.assertFalse(profiler.tick())
+        finally:
+            profiler.stop()
+
+    def test_rotation(self):
+        profiler = AllocationProfiler(self.report, interval=0.0, max_bytes=1, backups=2)
+        profiler.start()
+        try:
+            for _ in range(4):
+                profiler.tick()
+        finally:
+            profiler.stop()
+
+        self.assertTrue(self.report.exists())
+        self.assertTrue(Path(f"{self.report}.1").exists())
+        self.assertTrue(Path(f"{self.report}.2").exists())
+        self.assertFalse(Path(f"{self.report}.3").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import unittest
+import tempfile
+from unittest.mock import patch
+import sys
+import os
+from pathlib import Path
+
+# Add project root to path so we can import pyrri
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pyrri.configuration import Configuration, RestrictionAction
+from pyrri.tron import ProcessInfo, Tron
+
+PROFILES = {
+    "unrestricted_times": [[[0, 16, 0], [0, 20, 0]]],
+    "rules": [{"process_regex": "firefox", "action": "terminate"}],
+    "profiles": {
+        "alice": {
+            "users": ["alice"],
+            "unrestricted_times": [],
+            "rules": [
+                {"process_regex": "steam", "action": "minimize"},
+                {"title_regex": "Minecraft", "action": "minimize"},
+            ],
+        },
+        "kids": {
+            "users": ["alice", "bob"],
+            "unrestricted_times": [],
+            "rules": [{"process_regex": "java", "action": "terminate"}],
+        },
+        "bob": {
+            "users": ["bob"],
+            "unrestricted_times": [[[0, 0, 0], [6, 23, 59]]],
+            "rules": [],
+        },
+    },
+}
+
+WINDOW = ("Minecraft 1.21", "java.exe", 42, 4242)
+
+
+class TestTron(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.tron = Tron(Path(self.tmpdir.name) / "log.txt", session_user="alice")
+        self.tron.config = Configuration.from_json(PROFILES)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @patch("pyrri.tron.get_current_time_info")
+    def test_is_restricted_time_with_profiles(self, mock_time_info):
+        # The default profile is unrestricted, alice's profiles are not
+        mock_time_info.return_value = (0, 17, 0)
+        self.assertTrue(self.tron.is_restricted_time())
+
+        # bob's profile does not apply to alice
+        self.tron.config = Configuration.from_json(
+            {"profiles": {"bob": PROFILES["profiles"]["bob"]}}
+        )
+        self.assertFalse(self.tron.is_restricted_time())
+
+    @patch("pyrri.tron.is_session_locked", return_value=False)
+    @patch("pyrri.tron.get_current_time_info", return_value=(0, 12, 0))
+    @patch("pyrri.tron.get_active_window_info", return_value=WINDOW)
+    def test_first_matching_profile_wins(
+        self, mock_window_info, mock_time_info, mock_locked
+    ):
+        decision = self.tron.evaluate_guard()
+
+        # Window info is fetched once for all profiles
+        mock_window_info.assert_called_once()
+        self.assertEqual(decision[0], ProcessInfo(*WINDOW))
+        self.assertEqual(decision[1], RestrictionAction.MINIMIZE)
+
+        (rec,) = self.tron.trace.records()
+        self.assertEqual(rec.profile, "alice")
+        self.assertEqual(rec.rule, 1)
+        self.assertEqual(rec.action, "minimize")
+        self.assertEqual(rec.evaluated, (("default", 1), ("alice", 2), ("kids", 1)))
+
+    @patch("pyrri.tron.minimize_window")
+    @patch("pyrri.tron.time")
+    @patch("pyrri.tron.is_session_locked", return_value=False)
+    @patch("pyrri.tron.get_current_time_info", return_value=(0, 12, 0))
+    @patch("pyrri.tron.get_active_window_info", return_value=WINDOW)
+    def test_latency_is_stored_on_the_decision_carried_out(
+        self, mock_window_info, mock_time_info, mock_locked, mock_time, mock_minimize
+    ):
+        mock_time.time.side_effect = [0.0, 4.0, 8.0, 5.5, 9.0]
+        first = self.tron.evaluate_guard()
+        # Queued while the first action is still running
+        second = self.tron.evaluate_guard()
+        dropped = self.tron.evaluate_guard()
+
+        self.tron.drop_action(*dropped)
+        self.tron.restriction_action(*first)
+        self.tron.restriction_action(*second)
+
+        records = self.tron.trace.records()
+        self.assertEqual([rec.time for rec in records], [0.0, 4.0, 8.0])
+        self.assertEqual([rec.action_latency for rec in records], [5.5, 5.0, None])
+        self.assertEqual([rec.dropped for rec in records], [False, False, True])
+
+    @patch("pyrri.tron.is_session_locked", return_value=False)
+    @patch("pyrri.tron.get_current_time_info", return_value=(0, 12, 0))
+    @patch("pyrri.tron.get_active_window_info", return_value=WINDOW)
+    def test_trigger_file_dumps_trace(
+        self, mock_window_info, mock_time_info, mock_locked
+    ):
+        trace_file = Path(self.tmpdir.name) / "trace.jsonl"
+        tron = Tron(
+            Path(self.tmpdir.name) / "log.txt",
+            session_user="alice",
+            trace_file=trace_file,
+        )
+        tron.config = self.tron.config
+        tron.evaluate_guard()
+
+        tron.maintenance_tick()
+        self.assertFalse(trace_file.exists())
+
+        tron.trace_request_file.touch()
+        tron.maintenance_tick()
+        self.assertFalse(tron.trace_request_file.exists())
+        (line,) = trace_file.read_text().splitlines()
+        self.assertEqual(json.loads(line)["profile"], "alice")
+
+
+if __name__ == "__main__":
+    unittest.main()
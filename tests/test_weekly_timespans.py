@@ -17,6 +17,36 @@ class TestWeeklyTimespans(unittest.TestCase):
         with self.assertRaises(ValueError):
             TimePoint(0, 0, 60)  # Invalid minute
 
+    def test_timepoint_packing(self):
+        tp = TimePoint(2, 13, 45)
+
+        self.assertEqual((tp.weekday, tp.hour, tp.minute), (2, 13, 45))
+        self.assertEqual(tp.to_minutes(), 2 * 24 * 60 + 13 * 60 + 45)
+        self.assertEqual(TimePoint.from_minutes(tp.to_minutes()), tp)
+        self.assertEqual(repr(tp), "TimePoint(weekday=2, hour=13, minute=45)")
+        with self.assertRaises(ValueError):
+            TimePoint.from_minutes(7 * 24 * 60)
+
+    def test_timepoint_equality_and_ordering(self):
+        self.assertEqual(TimePoint(0, 10, 0), TimePoint(0, 10, 0))
+        self.assertEqual(hash(TimePoint(0, 10, 0)), hash(TimePoint(0, 10, 0)))
+        self.assertNotEqual(TimePoint(0, 10, 0), TimePoint(0, 10, 1))
+        self.assertLess(TimePoint(0, 23, 59), TimePoint(1, 0, 0))
+        self.assertGreaterEqual(TimePoint(1, 0, 0), TimePoint(1, 0, 0))
+        self.assertNotEqual(TimePoint(0, 0, 0), (0, 0, 0))
+
+    def test_immutability(self):
+        tp = TimePoint(0, 10, 0)
+        span = TimeSpan(tp, TimePoint(0, 11, 0))
+
+        with self.assertRaises(AttributeError):
+            tp.minutes = 5
+        with self.assertRaises(AttributeError):
+            span.start = TimePoint(0, 9, 0)
+        with self.assertRaises(AttributeError):
+            tp.extra = 1
+        self.assertEqual(span, TimeSpan(TimePoint(0, 10, 0), TimePoint(0, 11, 0)))
+
     def test_timespan_validation(self):
         tp1 = TimePoint(0, 10, 0)
         tp2 = TimePoint(0, 11, 0)
@@ -154,6 +154,131 @@ class TestWinProc(unittest.TestCase):
 
         mock_send_char.assert_called_once_with(hwnd, "a")
 
+    def test_text_events(self):
+        events = core.text_events("a\U0001f600")
+
+        # One down/up pair per UTF-16 code unit, emoji is a surrogate pair
+        self.assertEqual(len(events), 6)
+        self.assertEqual(events[0], (0, ord("a"), core.KEYEVENTF_UNICODE))
+        self.assertEqual(
+            events[1],
+            (0, ord("a"), core.KEYEVENTF_UNICODE | core.KEYEVENTF_KEYUP),
+        )
+        self.assertEqual(events[2], (0, 0xD83D, core.KEYEVENTF_UNICODE))
+        self.assertEqual(events[4], (0, 0xDE00, core.KEYEVENTF_UNICODE))
+
+    def test_key_events_with_modifier(self):
+        events = core.key_events(ord("V"), modifiers=(win32con.VK_CONTROL,))
+
+        self.assertEqual(
+            events,
+            [
+                (win32con.VK_CONTROL, 0, 0),
+                (ord("V"), 0, 0),
+                (ord("V"), 0, core.KEYEVENTF_KEYUP),
+                (win32con.VK_CONTROL, 0, core.KEYEVENTF_KEYUP),
+            ],
+        )
+
+    @patch("pyrri.winproc.core.ctypes.windll", create=True)
+    def test_send_input_single_batch(self, mock_windll):
+        events = core.text_events("https://example.org")
+        core.send_input(events)
+
+        mock_windll.user32.SendInput.assert_called_once()
+        count, inputs, size = mock_windll.user32.SendInput.call_args.args
+        self.assertEqual(count, len(events))
+        self.assertEqual(len(inputs), len(events))
+        self.assertEqual(inputs[0].union.ki.wScan, ord("h"))
+
+    @patch("pyrri.winproc.core.wait_for_idle")
+    @patch("pyrri.winproc.core.send_input")
+    @patch("pyrri.winproc.core.send_char")
+    @patch("pyrri.winproc.core.win32gui")
+    def test_browser_force_navigate_batched(
+        self, mock_win32gui, mock_send_char, mock_send_input, mock_wait_for_idle
+    ):
+        hwnd = 12345
+        url = "https://example.org"
+        mock_win32gui.GetForegroundWindow.return_value = hwnd
+        mock_send_input.side_effect = len
+
+        core.browser_force_navigate(hwnd, url)
+
+        # F6, then URL and Enter in one batch, no per-character messages
+        self.assertEqual(mock_send_input.call_count, 2)
+        mock_send_input.assert_any_call(core.key_events(win32con.VK_F6))
+        mock_send_input.assert_called_with(
+            core.text_events(url) + core.key_events(win32con.VK_RETURN)
+        )
+        mock_send_char.assert_not_called()
+        self.assertEqual(mock_wait_for_idle.call_count, 2)
+
+    @patch("pyrri.winproc.core.wait_for_idle")
+    @patch("pyrri.winproc.core.send_input")
+    @patch("pyrri.winproc.core.set_clipboard_text")
+    @patch("pyrri.winproc.core.win32gui")
+    def test_browser_force_navigate_paste(
+        self, mock_win32gui, mock_set_clipboard, mock_send_input, mock_wait_for_idle
+    ):
+        hwnd = 12345
+        url = "https://example.org"
+        mock_win32gui.GetForegroundWindow.return_value = hwnd
+        mock_send_input.side_effect = len
+
+        core.browser_force_navigate(hwnd, url, strategy="paste")
+
+        mock_set_clipboard.assert_called_once_with(url)
+        mock_send_input.assert_called_with(
+            core.key_events(ord("V"), modifiers=(win32con.VK_CONTROL,))
+            + core.key_events(win32con.VK_RETURN)
+        )
+
+    @patch("pyrri.winproc.core.post_force_navigate")
+    @patch("pyrri.winproc.core.wait_for_idle")
+    @patch("pyrri.winproc.core.send_input")
+    @patch("pyrri.winproc.core.win32gui")
+    def test_browser_force_navigate_blocked_input(
+        self,
+        mock_win32gui,
+        mock_send_input,
+        mock_wait_for_idle,
+        mock_post_force_navigate,
+    ):
+        # SendInput returns 0 when UIPI blocks injection (elevated browser)
+        mock_win32gui.GetForegroundWindow.return_value = 12345
+        mock_send_input.return_value = 0
+
+        used = core.browser_force_navigate(12345, "a")
+
+        self.assertEqual(used, "post")
+        mock_send_input.assert_called_once()
+        mock_post_force_navigate.assert_called_once_with(12345, "a")
+
+    @patch("pyrri.winproc.core.post_force_navigate")
+    @patch("pyrri.winproc.core.send_input")
+    @patch("pyrri.winproc.core.win32gui")
+    def test_browser_force_navigate_background_window(
+        self, mock_win32gui, mock_send_input, mock_post_force_navigate
+    ):
+        # SendInput only reaches the foreground window, so fall back to posting
+        mock_win32gui.GetForegroundWindow.return_value = 999
+
+        core.browser_force_navigate(12345, "a")
+
+        mock_post_force_navigate.assert_called_once_with(12345, "a")
+        mock_send_input.assert_not_called()
+
+    @patch("pyrri.winproc.core.time")
+    def test_wait_until(self, mock_time):
+        mock_time.monotonic.side_effect = [0.0, 0.5, 1.0, 1.5]
+        results = iter([False, False, True])
+
+        self.assertTrue(core.wait_until(lambda: next(results), timeout=2.0))
+
+        mock_time.monotonic.side_effect = [0.0, 0.5, 1.0, 2.5]
+        self.assertFalse(core.wait_until(lambda: False, timeout=2.0))
+
 
 if __name__ == "__main__":
     unittest.main()